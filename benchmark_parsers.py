@@ -0,0 +1,228 @@
+import io
+import os
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from listing_parser import (HTML_PARSER, parse_listing_html, parse_search_cards, parse_meta_description,
+                            extract_agents, extract_non_compass_agents, extract_image_urls, extract_county_from_url)
+from html_archive import ARCHIVE_DIR, iter_archive, read_body
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "compass")
+EXPECTED_FILE = "expected.json"
+DETAIL_FIELDS = ("price", "address", "beds", "baths", "sqft", "description",
+                 "listing_agents", "agent_company", "image_photos")
+
+
+def photo_key(image_url):
+    """Identify the photo behind an image URL, ignoring the rendition (".../1500x1000.jpg")."""
+    path = urlparse(image_url).path
+    return path.rsplit("/", 1)[0] if "/" in path.strip("/") else path
+
+
+def load_corpus(fixtures_dir=FIXTURES_DIR):
+    """Return the expected.json page entries, each with its HTML under "html"."""
+    with open(os.path.join(fixtures_dir, EXPECTED_FILE)) as f:
+        pages = json.load(f)["pages"]
+
+    for page in pages:
+        with open(os.path.join(fixtures_dir, page["file"]), encoding="utf-8") as f:
+            page["html"] = f.read()
+    return pages
+
+
+def _meta_fields(page, soup):
+    meta = soup.find("meta", {"name": "description"})
+    address, price, beds, baths, sqft = parse_meta_description(meta["content"] if meta else "")
+    return {"address": address, "price": price, "beds": beds, "baths": baths, "sqft": sqft}
+
+
+def _agent_fields(page, soup):
+    names, companies = extract_agents(None, soup)
+    return {"listing_agents": "; ".join(names), "agent_company": "; ".join(companies)}
+
+
+def _non_compass_fields(page, soup):
+    names, companies = extract_non_compass_agents(soup)
+    if page.get("variant") != "non_compass_agent":
+        return {}  # Only scored where every listed agent is from another brokerage
+    return {"listing_agents": "; ".join(names), "agent_company": "; ".join(companies)}
+
+
+def _image_fields(page, soup):
+    return {"image_photos": [photo_key(url) for url in extract_image_urls(soup)]}
+
+
+def _county_fields(page, soup):
+    return {"county": extract_county_from_url(page["url"], page["expected"]["address"])}
+
+
+def _listing_fields(page, soup):
+    fields = parse_listing_html(page["html"], page["url"])
+    fields["image_photos"] = [photo_key(url) for url in fields.pop("image_urls")]
+    return fields
+
+
+# (name, function, uses the shared soup, DOM-only extractor)
+DETAIL_EXTRACTORS = (
+    ("meta_description", _meta_fields, True, True),
+    ("extract_agents", _agent_fields, True, True),
+    ("extract_non_compass_agents", _non_compass_fields, True, True),
+    ("image_urls", _image_fields, True, True),
+    ("county", _county_fields, False, False),
+    ("parse_listing_html", _listing_fields, False, False),
+)
+
+
+def _time(function, pages, repeat):
+    """Run function(page) over every page `repeat` times; returns (pages/sec, last outputs)."""
+    with redirect_stdout(io.StringIO()):  # The extractors log every match
+        outputs = [function(page) for page in pages]  # Warm-up pass (lazy indexes, regex caches)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs = [function(page) for page in pages]
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed if elapsed else float("inf"), outputs
+
+
+def _score(checked, correct, mismatches, name, page, output, fields):
+    for field in fields:
+        if field not in output or field not in page["expected"]:
+            continue
+        checked[name] += 1
+        if output[field] == page["expected"][field]:
+            correct[name] += 1
+        else:
+            mismatches.append((name, page["file"], field, page["expected"][field], output[field]))
+
+
+def run_benchmark(fixtures_dir=FIXTURES_DIR, repeat=20):
+    """
+    Time every extractor over the fixture corpus and compare its output with expected.json.
+
+    Returns:
+        dict: {"rows": [(extractor, pages/sec, correct, checked)], "mismatches": [...]}
+    """
+    pages = load_corpus(fixtures_dir)
+    detail_pages = [page for page in pages if page["kind"] == "detail"]
+    search_pages = [page for page in pages if page["kind"] == "search"]
+
+    rows, mismatches = [], []
+    checked, correct = {}, {}
+
+    soup_rate, soups = _time(lambda page: BeautifulSoup(page["html"], HTML_PARSER), detail_pages, repeat)
+    rows.append(("BeautifulSoup build", soup_rate, None, None))
+    soup_by_file = {page["file"]: soup for page, soup in zip(detail_pages, soups)}
+
+    for name, function, uses_soup, dom_only in DETAIL_EXTRACTORS:
+        rate, outputs = _time(lambda page: function(page, soup_by_file[page["file"]] if uses_soup else None),
+                              detail_pages, repeat)
+        checked[name] = correct[name] = 0
+        for page, output in zip(detail_pages, outputs):
+            if dom_only and page.get("dom_fields") is False:
+                continue  # The page only carries these fields in its embedded JSON
+            _score(checked, correct, mismatches, name, page, output, DETAIL_FIELDS + ("county",))
+        rows.append((name, rate, correct[name], checked[name]))
+
+    if search_pages:
+        name = "parse_search_cards"
+        rate, outputs = _time(lambda page: parse_search_cards(page["html"]), search_pages, repeat)
+        checked[name] = correct[name] = 0
+        for page, cards in zip(search_pages, outputs):
+            expected_cards = page["expected"]["cards"]
+            for position in range(max(len(cards), len(expected_cards))):
+                checked[name] += 1
+                expected = expected_cards[position] if position < len(expected_cards) else None
+                actual = {key: value for key, value in cards[position].items() if key != "card_hash"} \
+                    if position < len(cards) else None
+                if actual == expected:
+                    correct[name] += 1
+                else:
+                    mismatches.append((name, page["file"], f"card {position}", expected, actual))
+        rows.append((name, rate, correct[name], checked[name]))
+
+    return {"rows": rows, "mismatches": mismatches, "pages": len(pages)}
+
+
+def print_report(report):
+    print(f"\n📊 Parser benchmark over {report['pages']} fixture pages\n")
+    print(f"{'extractor':<28} {'pages/sec':>12} {'accuracy':>16}")
+    for name, rate, correct, checked in report["rows"]:
+        accuracy = f"{correct}/{checked} ({correct / checked:.0%})" if checked else "-"
+        print(f"{name:<28} {rate:>12,.0f} {accuracy:>16}")
+
+    if report["mismatches"]:
+        print(f"\n❌ {len(report['mismatches'])} mismatches:")
+        for name, file, field, expected, actual in report["mismatches"]:
+            print(f"  {name} · {file} · {field}\n    expected: {expected!r}\n    actual:   {actual!r}")
+    else:
+        print("\n✅ Every checked field matches expected.json")
+
+
+def capture_fixtures(archive_dir=ARCHIVE_DIR, fixtures_dir=FIXTURES_DIR, limit=10):
+    """
+    Copy archived raw detail pages into the corpus.
+
+    Expected values are pre-filled from the current parser and marked "reviewed": false;
+    check them by hand before relying on the accuracy figures.
+    """
+    expected_path = os.path.join(fixtures_dir, EXPECTED_FILE)
+    with open(expected_path) as f:
+        manifest = json.load(f)
+    known_urls = {page["url"] for page in manifest["pages"]}
+
+    added = 0
+    for metadata in iter_archive(archive_dir):
+        if added >= limit:
+            break
+        if metadata["kind"] != "html" or metadata["url"] in known_urls:
+            continue
+
+        html = read_body(metadata)
+        with redirect_stdout(io.StringIO()):
+            fields = parse_listing_html(html, metadata["url"])
+            county = extract_county_from_url(metadata["url"], fields["address"])
+        fields["image_photos"] = [photo_key(url) for url in fields.pop("image_urls")]
+        fields["county"] = county
+
+        file_name = f"captured_{os.path.basename(os.path.dirname(metadata['body_path']))}.html"
+        with open(os.path.join(fixtures_dir, file_name), "w", encoding="utf-8") as f:
+            f.write(html)
+
+        manifest["pages"].append({"file": file_name, "kind": "detail", "variant": "captured",
+                                  "url": metadata["url"], "reviewed": False, "expected": fields})
+        known_urls.add(metadata["url"])
+        added += 1
+
+    with open(expected_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    print(f"✅ Captured {added} archived pages into {fixtures_dir} - review their expected values")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the listing extractors against the saved page corpus.")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    subparsers = parser.add_subparsers(dest="command")
+
+    run = subparsers.add_parser("run", help="Time the extractors and check their output (default)")
+    run.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per extractor")
+
+    capture = subparsers.add_parser("capture", help="Add archived pages (see html_archive.py) to the corpus")
+    capture.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    capture.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        capture_fixtures(args.archive_dir, args.fixtures, args.limit)
+    else:
+        print_report(run_benchmark(args.fixtures, getattr(args, "repeat", 20)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import threading
+
+CHECKPOINT_PATH = "scrape_checkpoint.json"
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of the current scrape run, rewritten after every listing.
+
+    For each search URL it keeps the listing cards found (the work queue, in
+    search order) and the finished listing records by search position. A run
+    started with resume picks up the saved cards instead of crawling the search
+    again and only visits listings that have no record yet.
+
+    Writes go to a temp file that is fsynced and then renamed over the
+    checkpoint, so a crash mid-write never leaves a truncated file behind.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {"started_at": time.time(), "searches": {}}
+
+    def load(self):
+        """
+        Load the checkpoint left by a previous run.
+
+        Returns:
+            bool: True if there was a checkpoint to resume from
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self._state = state
+
+        done = sum(len(search["completed"]) for search in state["searches"].values())
+        print(f"♻️ Resuming from checkpoint: {done} listings already scraped in {len(state['searches'])} search(es)")
+        return True
+
+    def search_state(self, search_url):
+        """
+        Returns:
+            dict: {"county", "cards", "completed"} for a search started by an earlier run, else None.
+                "completed" maps the search position (as a string) to the listing record.
+        """
+        with self._lock:
+            return self._state["searches"].get(search_url)
+
+    def start_search(self, search_url, county, cards):
+        """Save the cards found for a search before any detail page is visited."""
+        with self._lock:
+            self._state["searches"][search_url] = {"county": county, "cards": cards, "completed": {}}
+            self._save()
+
+    def complete_listings(self, search_url, indexed_listings):
+        """Record finished (search position, listing) pairs; a None listing was skipped on purpose."""
+        if not indexed_listings:
+            return
+        with self._lock:
+            completed = self._state["searches"][search_url]["completed"]
+            for index, listing in indexed_listings:
+                completed[str(index)] = listing
+            self._save()
+
+    def all_done(self):
+        """True when every card of every started search has a finished record."""
+        with self._lock:
+            return all(len(search["completed"]) >= len(search["cards"])
+                       for search in self._state["searches"].values())
+
+    def clear(self):
+        """Forget the run once it has finished."""
+        with self._lock:
+            self._state = {"started_at": time.time(), "searches": {}}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,87 @@
+import re
+from urllib.parse import urlparse, urlunparse
+
+# Output size we post at (Instagram's 1080 px wide feed images)
+IMAGE_TARGET_PX = 1080
+
+COMPASS_IMAGE_HOSTS = ("www.compass.com", "compass.com")
+
+# /m/<photo id path>/<rendition>.<ext>, where the rendition is "WxH" or "origin"
+COMPASS_IMAGE_PATH_PATTERN = re.compile(r"^(/m/.+)/(?:(\d+)x\d+|origin)\.(?:jpe?g|png|webp)$", re.IGNORECASE)
+
+
+def _match_compass_image(image_url):
+    parsed = urlparse(image_url)
+    if parsed.netloc.lower() not in COMPASS_IMAGE_HOSTS:
+        return None
+    return COMPASS_IMAGE_PATH_PATTERN.match(parsed.path)
+
+
+def clean_image_url(image_url):
+    """Strip whitespace and the fragment, and give protocol-relative URLs a scheme."""
+    image_url = image_url.strip()
+    if image_url.startswith("//"):
+        image_url = f"https:{image_url}"
+    return urlunparse(urlparse(image_url)._replace(fragment=""))
+
+
+def photo_id(image_url):
+    """
+    The part of a Compass CDN URL that names the photo, shared by all its renditions.
+
+    Returns:
+        str: Path prefix such as "/m/0/6a1f52c4-...", or None for non-Compass URLs
+    """
+    match = _match_compass_image(image_url.strip())
+    return match.group(1) if match else None
+
+
+def rendition_width(image_url):
+    """Width of a Compass rendition URL (".../1500x1000.jpg" → 1500); None for "origin" and other URLs."""
+    match = _match_compass_image(image_url)
+    return int(match.group(2)) if match and match.group(2) else None
+
+
+def pick_rendition(image_urls, target_px=IMAGE_TARGET_PX):
+    """
+    Choose one of the URLs a page referenced for the same photo.
+
+    Takes the smallest rendition at least `target_px` wide; failing that the original
+    upload ("origin"), then the largest rendition, then the first URL. URLs are never
+    rewritten, so the size and extension are ones the page actually linked.
+    """
+    widths = [(rendition_width(url), url) for url in image_urls]
+
+    wide_enough = [(width, url) for width, url in widths if width and width >= target_px]
+    if wide_enough:
+        return min(wide_enough, key=lambda rendition: rendition[0])[1]
+
+    for width, url in widths:
+        if width is None and _match_compass_image(url):
+            return url
+
+    sized = [(width, url) for width, url in widths if width]
+    if sized:
+        return max(sized, key=lambda rendition: rendition[0])[1]
+
+    return image_urls[0]
+
+
+def normalize_image_urls(image_urls, target_px=IMAGE_TARGET_PX):
+    """
+    Keep one URL per photo, in gallery order (see pick_rendition for which one).
+
+    The hero image and its carousel copy (different renditions of the same photo)
+    collapse into a single entry.
+    """
+    renditions = {}  # photo → URLs referenced for it; dicts keep first-seen (gallery) order
+
+    for image_url in image_urls:
+        if not image_url:
+            continue
+        url = clean_image_url(image_url)
+        photo_urls = renditions.setdefault(photo_id(url) or url, [])
+        if url not in photo_urls:
+            photo_urls.append(url)
+
+    return [pick_rendition(photo_urls, target_px) for photo_urls in renditions.values()]
@@ -0,0 +1,164 @@
+import os
+import re
+import bz2
+import gzip
+import json
+import argparse
+import threading
+from collections import Counter, defaultdict
+
+# Bundled with the code, so resolved next to this module rather than the working directory
+COUNTY_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "county_index.json.gz")
+
+# A ZIP only counts after the state code; a bare 5-digit number is often the house number
+ZIP_PATTERN = re.compile(r",\s*[A-Z]{2}\s+(\d{5})(?:-\d{4})?\b")
+URL_ZIP_PATTERN = re.compile(r"-[a-z]{2}-(\d{5})(?=[/-]|$)", re.IGNORECASE)
+CITY_STATE_PATTERN = re.compile(r"([^,]+),\s*([A-Z]{2})\b(?:\s+\d{5}(?:-\d{4})?)?\s*$")
+
+
+def _place_key(city, state):
+    return f"{state.strip().upper()}:{' '.join(city.lower().replace('.', '').split())}"
+
+
+class CountyIndex:
+    """
+    ZIP -> county and city/state -> county lookups for every US county.
+
+    Backed by the bundled county_index.json.gz: a list of county names plus
+    ZIP and place maps pointing into it. The file is read once, on the first
+    lookup, so importing this module (e.g. in parse worker processes) stays cheap.
+    """
+
+    def __init__(self, path=COUNTY_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._counties = None
+        self._zips = None
+        self._places = None
+
+    def _load(self):
+        with self._lock:
+            if self._counties is not None:
+                return
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not load county index {self.path}: {e}")
+                data = {"counties": [], "zips": {}, "places": {}}
+            self._zips = data["zips"]
+            self._places = data["places"]
+            self._counties = data["counties"]
+
+    def county_for_zip(self, zip_code):
+        """Return e.g. "Montgomery County" for "20816", or None for an unknown ZIP."""
+        if self._counties is None:
+            self._load()
+        index = self._zips.get(str(zip_code)[:5])
+        return self._counties[index] if index is not None else None
+
+    def county_for_city(self, city, state):
+        """Return the county a city/town is (mostly) in, or None if the place is unknown."""
+        if self._counties is None:
+            self._load()
+        index = self._places.get(_place_key(city, state))
+        return self._counties[index] if index is not None else None
+
+    def lookup(self, address=None, listing_url=None):
+        """
+        Find the county of a listing from its address or URL.
+
+        Tries the ZIP following the state code in the address, then the ZIP in the
+        listing URL slug, then the "City, ST" part of the address.
+
+        Returns:
+            str: County name such as "Montgomery County", or None if nothing matched
+        """
+        if address and address != "N/A":
+            zip_matches = ZIP_PATTERN.findall(address)
+            if zip_matches:
+                county = self.county_for_zip(zip_matches[-1])
+                if county:
+                    return county
+
+        if listing_url:
+            url_match = URL_ZIP_PATTERN.search(listing_url)
+            if url_match:
+                county = self.county_for_zip(url_match.group(1))
+                if county:
+                    return county
+
+        if address and address != "N/A":
+            place_match = CITY_STATE_PATTERN.search(address)
+            if place_match:
+                return self.county_for_city(place_match.group(1), place_match.group(2))
+
+        return None
+
+
+def build_index(source_path, out_path=COUNTY_INDEX_PATH):
+    """
+    Rebuild the bundled index from the zips.json.bz2 file shipped with the
+    `zipcodes` package (MIT licensed, one record per ZIP with its city, state and county).
+
+    A place maps to the county most of its ZIP codes are in; alternate city names
+    on a ZIP only fill in places that have no primary ZIP of their own.
+    """
+    with bz2.open(source_path, "rt", encoding="utf-8") as f:
+        records = json.load(f)
+
+    counties = []
+    county_ids = {}
+    zips = {}
+    primary_places = defaultdict(Counter)
+    alternate_places = defaultdict(Counter)
+
+    for record in records:
+        county = record.get("county")
+        if not county or record.get("country", "US") != "US":
+            continue
+
+        if county not in county_ids:
+            county_ids[county] = len(counties)
+            counties.append(county)
+        county_id = county_ids[county]
+
+        zips[record["zip_code"]] = county_id
+        primary_places[_place_key(record["city"], record["state"])][county_id] += 1
+        for city in record.get("acceptable_cities") or []:
+            alternate_places[_place_key(city, record["state"])][county_id] += 1
+
+    places = {key: votes.most_common(1)[0][0] for key, votes in alternate_places.items()}
+    places.update({key: votes.most_common(1)[0][0] for key, votes in primary_places.items()})
+
+    with gzip.open(out_path, "wt", encoding="utf-8") as f:
+        json.dump({"counties": counties, "zips": zips, "places": places}, f, separators=(",", ":"), sort_keys=True)
+
+    print(f"✅ Indexed {len(zips)} ZIP codes and {len(places)} places in {len(counties)} counties → {out_path}")
+
+
+# ✅ Shared index, loaded on first lookup
+county_index = CountyIndex()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the bundled ZIP/city -> county index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Rebuild the index from the zipcodes package's zips.json.bz2")
+    build.add_argument("source", help="Path to zips.json.bz2")
+    build.add_argument("--out", default=COUNTY_INDEX_PATH)
+
+    lookup = subparsers.add_parser("lookup", help="Look up the county of an address")
+    lookup.add_argument("address")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.source, args.out)
+    elif args.command == "lookup":
+        print(county_index.lookup(args.address) or "Unknown County")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,9 +13,12 @@ def authenticate_google_sheets():
     return gspread.authorize(creds)
 
 
-def save_to_google_sheets(data, sheet_name="Real_Estate_Faceless"):
-    """Appends new listings and batch updates existing ones in Google Sheets while minimizing read requests."""
-    client = authenticate_google_sheets()
+def save_to_google_sheets(data, sheet_name="Real_Estate_Faceless", client=None):
+    """
+    Appends new listings and batch updates existing ones in Google Sheets while minimizing read requests.
+    Pass an already authenticated `client` to skip the OAuth round trip (see scrape_service.py).
+    """
+    client = client or authenticate_google_sheets()
     spreadsheet = client.open(sheet_name)
 
     # ✅ Cache worksheets to prevent multiple API calls
@@ -0,0 +1,172 @@
+import os
+import json
+import gzip
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from listing_parser import parse_listing_html, map_dom_snapshot, extract_county_from_url
+
+try:
+    import zstandard
+except ImportError:  # Fall back to gzip so archiving never blocks a scrape
+    zstandard = None
+
+ARCHIVE_DIR = "html_archive"
+ZSTD_LEVEL = 10
+
+
+def _compress(data):
+    if zstandard:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ".zst"
+    return gzip.compress(data), ".gz"
+
+
+def _decompress(data, filename):
+    if filename.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {filename}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def archive_page(url, body, kind="html", source="http", status=200, headers=None, archive_dir=ARCHIVE_DIR):
+    """
+    Archive a fetched detail page with its fetch metadata.
+
+    Args:
+        url (str): Page URL
+        body (str): Raw HTML, or the JSON-encoded in-browser snapshot when kind="snapshot"
+        kind (str): "html" or "snapshot"
+        source (str): How it was fetched ("http" or "browser")
+        status (int): HTTP status of the fetch
+        headers (dict): Response headers worth keeping (ETag, Last-Modified, ...)
+
+    Returns:
+        str: Path of the archived body, or None if archiving failed
+    """
+    try:
+        fetched_at = time.time()
+        url_dir = os.path.join(archive_dir, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16])
+        os.makedirs(url_dir, exist_ok=True)
+
+        data, extension = _compress(body.encode("utf-8"))
+        base = os.path.join(url_dir, f"{int(fetched_at * 1000)}.{kind}")
+        with open(base + extension, "wb") as f:
+            f.write(data)
+
+        metadata = {
+            "url": url,
+            "kind": kind,
+            "source": source,
+            "status": status,
+            "fetched_at": fetched_at,
+            "headers": headers or {},
+            "body_file": os.path.basename(base + extension),
+            "raw_bytes": len(body.encode("utf-8")),
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(metadata, f)
+
+        return base + extension
+
+    except Exception as e:
+        print(f"⚠️ Could not archive {url}: {e}")
+        return None
+
+
+def iter_archive(archive_dir=ARCHIVE_DIR, latest_only=True):
+    """
+    Yield the metadata of archived pages, with the body path under "body_path".
+
+    With latest_only, only the most recent fetch of each URL is returned.
+    """
+    if not os.path.isdir(archive_dir):
+        return
+
+    for url_dir in sorted(os.scandir(archive_dir), key=lambda entry: entry.name):
+        if not url_dir.is_dir():
+            continue
+
+        metadata_files = sorted(name for name in os.listdir(url_dir.path) if name.endswith(".json"))
+        if latest_only:
+            metadata_files = metadata_files[-1:]
+
+        for name in metadata_files:
+            with open(os.path.join(url_dir.path, name)) as f:
+                metadata = json.load(f)
+            metadata["body_path"] = os.path.join(url_dir.path, metadata["body_file"])
+            yield metadata
+
+
+def read_body(metadata):
+    """Return the decompressed body of an archived page (metadata as yielded by iter_archive)."""
+    with open(metadata["body_path"], "rb") as f:
+        return _decompress(f.read(), metadata["body_path"]).decode("utf-8")
+
+
+def reparse_entry(metadata):
+    """Re-run the extractors over one archived page. Runs in a worker process; no network."""
+    try:
+        body = read_body(metadata)
+
+        if metadata["kind"] == "snapshot":
+            fields = map_dom_snapshot(json.loads(body))
+        else:
+            fields = parse_listing_html(body, metadata["url"])
+
+        county_name = extract_county_from_url(metadata["url"], fields["address"])
+
+        return {
+            "listing_url": metadata["url"],
+            **fields,
+            "instagram_account": f"Most Expensive Homes in {county_name}",
+            "county": county_name.replace(" County", ""),
+            "fetched_at": metadata["fetched_at"],
+        }
+
+    except Exception as e:
+        return {"listing_url": metadata.get("url"), "error": str(e)}
+
+
+def reparse_archive(archive_dir=ARCHIVE_DIR, workers=None, latest_only=True):
+    """
+    Re-extract every archived page in a process pool.
+
+    Yields:
+        dict: One updated listing record (or {"listing_url", "error"}) per archived page
+    """
+    entries = list(iter_archive(archive_dir, latest_only=latest_only))
+    print(f"🗄️ Reparsing {len(entries)} archived pages")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(reparse_entry, entries, chunksize=16)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline tools for the archived Compass detail pages.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reparse = subparsers.add_parser("reparse", help="Re-run the extractors over the archive without the network")
+    reparse.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    reparse.add_argument("--out", default="reparsed_listings.jsonl", help="JSON lines output file")
+    reparse.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    reparse.add_argument("--all-versions", action="store_true", help="Reparse every archived fetch, not just the latest")
+
+    args = parser.parse_args()
+
+    if args.command == "reparse":
+        start = time.time()
+        count = errors = 0
+
+        with open(args.out, "w") as out:
+            for record in reparse_archive(args.archive_dir, args.workers, latest_only=not args.all_versions):
+                out.write(json.dumps(record) + "\n")
+                count += 1
+                errors += "error" in record
+
+        print(f"✅ Reparsed {count} pages ({errors} errors) in {time.time() - start:.1f}s → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
 import openai
 import time
 import random
+import threading
 from config import OPENAI_API_KEY, USE_MOCK_OPENAI
 
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """The process-wide OpenAI client, created on first use so its connection pool is reused across captions."""
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            _openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        return _openai_client
+
 
 def generate_instagram_post(description, price, beds, baths, sqft, address, listing_agents=None, agent_company=None):
     """
@@ -99,7 +112,7 @@ Follow us for more amazing luxury homes in Bethesda that'll make your jaw drop."
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
+            client = get_openai_client()
             response = client.chat.completions.create(
                 model="gpt-4",
                 messages=[
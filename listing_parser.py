@@ -0,0 +1,582 @@
+import re
+import json
+import hashlib
+from collections import deque
+from bs4 import BeautifulSoup
+from county_index import county_index
+from compass_images import normalize_image_urls
+
+try:
+    import lxml  # noqa: F401 - only probing for the faster tree builder
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Script globals Compass pages use to ship their server-side model
+PAGE_STATE_MARKERS = (
+    "window.__PARTIAL_INITIAL_DATA__",
+    "window.__INITIAL_DATA__",
+    "window.__INITIAL_STATE__",
+)
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+LD_JSON_PATTERN = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL)
+META_DESCRIPTION_PATTERN = re.compile(r'<meta[^>]*name="description"[^>]*content="([^"]*)"', re.IGNORECASE)
+LISTING_ID_PATTERN = re.compile(r"/listing/[^/]+/(\d+)/?")
+ZIP_CODE_PATTERN = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+_json_decoder = json.JSONDecoder()
+
+COMPASS_BASE_URL = "https://www.compass.com"
+CARD_PRICE_PATTERN = re.compile(r"\$\d{1,3}(?:,\d{3})+|\$\d+(?:\.\d+)?[MK]")
+CARD_BEDS_PATTERN = re.compile(r"(\d+)\s*(?:BD|Beds?)\b", re.IGNORECASE)
+CARD_BATHS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:BA|Baths?)\b", re.IGNORECASE)
+CARD_SQFT_PATTERN = re.compile(r"(\d{1,3}(?:,\d{3})*)\s*(?:Sq\.?\s*Ft|SF)\b", re.IGNORECASE)
+
+
+def parse_listing_page(listing_soup):
+    """
+    Extract the listing fields shared by every fetch path from a parsed detail page.
+
+    Args:
+        listing_soup (BeautifulSoup): Parsed listing detail page
+
+    Returns:
+        dict: price, beds, baths, sqft, address, description, listing_agents,
+            agent_company and image_urls ("N/A" where a field was not found)
+    """
+    price, beds, baths, sqft, address, description = "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"
+
+    remarks_section = listing_soup.find("div", {"data-tn": "uc-listing-description"})
+    if remarks_section:
+        spans = remarks_section.find_all("span")
+        description = " ".join([span.text.strip() for span in spans if span.text.strip()])
+
+    meta_description = listing_soup.find("meta", {"name": "description"})
+    if meta_description and meta_description.get("content"):
+        address, price, beds, baths, sqft = parse_meta_description(meta_description["content"])
+
+    # ✅ Extract Listing Agents (Compass & Non-Compass) using the improved method
+    agent_names, agent_companies = extract_agents(None, listing_soup)
+
+    image_urls = extract_image_urls(listing_soup)
+
+    return {
+        "price": price,
+        "address": address,
+        "beds": beds,
+        "baths": baths,
+        "sqft": sqft,
+        "description": description,
+        "listing_agents": "; ".join(agent_names),  # ✅ Separate multiple agents with ";"
+        "agent_company": "; ".join(agent_companies),  # ✅ Separate multiple companies with ";"
+        "image_urls": image_urls
+    }
+
+
+def extract_image_urls(listing_soup):
+    """Collect the hero image and every carousel image of a detail page, one URL per photo in gallery order."""
+    image_urls = []
+    hero_image = listing_soup.find("img", id="media-gallery-hero-image")
+    if hero_image and hero_image.get("src"):
+        image_urls.append(hero_image["src"])
+
+    carousel_images = listing_soup.select("img[data-flickity-lazyload-src]")
+    for img in carousel_images:
+        if img.get("data-flickity-lazyload-src"):
+            image_urls.append(img["data-flickity-lazyload-src"])
+
+    return normalize_image_urls(image_urls)
+
+
+def parse_search_cards(html):
+    """
+    Parse every uc-listingCard on a search results page in one pass.
+
+    Returns:
+        list: Card dicts (listing_url, price, address, beds, baths, sqft, card_hash) in
+            page order, skipping private exclusives and duplicate URLs
+    """
+    cards = []
+    seen_urls = set()
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for card in soup.find_all("div", class_="uc-listingCard"):
+        link_tag = card.find("a", href=True)
+        listing_url = f"{COMPASS_BASE_URL}{link_tag['href']}" if link_tag else None
+
+        if not listing_url or "/private-exclusives/" in listing_url or listing_url in seen_urls:
+            continue
+        seen_urls.add(listing_url)
+
+        card_text = card.get_text(" ", strip=True)
+        price_match = CARD_PRICE_PATTERN.search(card_text)
+        beds_match = CARD_BEDS_PATTERN.search(card_text)
+        baths_match = CARD_BATHS_PATTERN.search(card_text)
+        sqft_match = CARD_SQFT_PATTERN.search(card_text)
+
+        address_tag = card.select_one("[data-tn*='address'], h2, h3")
+        address = address_tag.get_text(" ", strip=True) if address_tag else "N/A"
+
+        card_fields = {
+            "listing_url": listing_url,
+            "price": price_match.group(0) if price_match else "N/A",
+            "address": address,
+            "beds": beds_match.group(1) if beds_match else "N/A",
+            "baths": baths_match.group(1) if baths_match else "N/A",
+            "sqft": sqft_match.group(1) if sqft_match else "N/A",
+        }
+        # Hash only the listing facts, not "days on market"-style text that changes daily
+        card_fields["card_hash"] = hashlib.sha256(
+            json.dumps(card_fields, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        cards.append(card_fields)
+
+    soup.decompose()
+    return cards
+
+
+def parse_price(price_text):
+    """Turn "$4,500,000" / "$4.5M" / "$950K" into a dollar amount; None if there is no price."""
+    match = re.search(r"\$\s*(\d[\d,]*(?:\.\d+)?)\s*([MK])?", price_text or "", re.IGNORECASE)
+    if not match:
+        return None
+
+    amount = float(match.group(1).replace(",", ""))
+    multiplier = {"M": 1_000_000, "K": 1_000}.get((match.group(2) or "").upper(), 1)
+    return int(amount * multiplier)
+
+
+def parse_meta_description(content):
+    """
+    Pull address, price, beds, baths and sqft out of the listing meta description.
+
+    Returns:
+        tuple: (address, price, beds, baths, sqft), "N/A" for anything not matched
+    """
+    address, price, beds, baths, sqft = "N/A", "N/A", "N/A", "N/A", "N/A"
+
+    address_match = re.search(r"^(.*?)(?: is a single family home| is a townhome)", content)
+    if address_match:
+        address = address_match.group(1)
+
+    price_match = re.search(r"listed for sale at (\$\d{1,3}(?:,\d{3})*)", content)
+    beds_match = re.search(r"(\d+)-bed", content)
+    baths_match = re.search(r"(\d+)-bath", content)
+    sqft_match = re.search(r"(\d{1,3}(?:,\d{3})*) sqft", content)
+
+    if price_match:
+        price = price_match.group(1)
+    if beds_match:
+        beds = beds_match.group(1)
+    if baths_match:
+        baths = baths_match.group(1)
+    if sqft_match:
+        sqft = sqft_match.group(1)
+
+    return address, price, beds, baths, sqft
+
+
+def map_dom_snapshot(snapshot):
+    """
+    Map the compact object returned by the browser-side extraction script onto the
+    listing field dict, applying the same regexes as the BeautifulSoup path.
+    """
+    price, beds, baths, sqft, address = "N/A", "N/A", "N/A", "N/A", "N/A"
+    if snapshot.get("meta_description"):
+        address, price, beds, baths, sqft = parse_meta_description(snapshot["meta_description"])
+
+    description = " ".join(snapshot.get("description_spans") or []) or "N/A"
+
+    agent_names, agent_companies = [], []
+
+    def add_agent(name, company):
+        if name and name not in agent_names:
+            agent_names.append(name)
+            agent_companies.append(company)
+
+    for name, company in zip(snapshot.get("compass_agents") or [], snapshot.get("compass_companies") or []):
+        add_agent(name, company.replace("Listed By ", "").strip())
+
+    non_compass_found = False
+    for container_text in snapshot.get("non_compass_agents") or []:
+        agent_name, company_name = parse_non_compass_agent_text(container_text)
+        if agent_name and company_name:
+            non_compass_found = True
+            add_agent(agent_name, company_name)
+
+    if not non_compass_found:
+        for agent_text in snapshot.get("listed_by_blocks") or []:
+            agent_name, company_name = parse_listed_by_text(agent_text)
+            if agent_name:
+                add_agent(agent_name, company_name)
+
+    image_urls = normalize_image_urls([snapshot.get("hero_image")] + (snapshot.get("carousel_images") or []))
+
+    # As a backup, use any large images on the page
+    if not image_urls:
+        image_urls = normalize_image_urls(snapshot.get("large_images") or [])
+
+    return {
+        "price": price,
+        "address": address,
+        "beds": beds,
+        "baths": baths,
+        "sqft": sqft,
+        "description": description,
+        "listing_agents": "; ".join(agent_names),
+        "agent_company": "; ".join(agent_companies),
+        "image_urls": image_urls
+    }
+
+
+def extract_page_state(html):
+    """
+    Find and decode the listing JSON embedded in a detail page, without building a DOM.
+
+    Returns:
+        list: Decoded JSON documents, most specific first (page-state globals, then
+            __NEXT_DATA__, then schema.org ld+json). Empty if none could be decoded.
+    """
+    documents = []
+
+    for marker in PAGE_STATE_MARKERS:
+        start = html.find(marker)
+        if start == -1:
+            continue
+
+        brace = html.find("{", start + len(marker))
+        if brace == -1:
+            continue
+
+        try:
+            state, _ = _json_decoder.raw_decode(html, brace)
+            documents.append(state)
+        except ValueError as e:
+            print(f"⚠️ Could not decode {marker}: {e}")
+
+    for pattern in (NEXT_DATA_PATTERN, LD_JSON_PATTERN):
+        for match in pattern.finditer(html):
+            try:
+                documents.append(json.loads(match.group(1)))
+            except ValueError:
+                continue
+
+    return documents
+
+
+def _is_listing_model(node):
+    if isinstance(node.get("location"), dict) and ("price" in node or "listingIdSHA" in node):
+        return True
+    return node.get("@type") in ("SingleFamilyResidence", "House", "Residence", "Product", "RealEstateListing")
+
+
+def _same_address(address, page_address):
+    """Loose match: same house number, and the same ZIP when both addresses carry one."""
+    tokens, page_tokens = address.lower().split(), page_address.lower().split()
+    if not tokens or not page_tokens or tokens[0] != page_tokens[0]:
+        return False
+    zip_match, page_zip_match = ZIP_CODE_PATTERN.search(address), ZIP_CODE_PATTERN.search(page_address)
+    return not (zip_match and page_zip_match) or zip_match.group(1) == page_zip_match.group(1)
+
+
+def _model_matches_page(model, listing_id=None, page_address=None):
+    """Reject a model that belongs to another home (e.g. a similar-listings entry)."""
+    if listing_id:
+        for key in ("listingId", "id"):
+            model_id = str(model.get(key) or "")
+            if model_id.isdigit():
+                return model_id == listing_id
+
+    if page_address and page_address != "N/A":
+        address = map_listing_model(model)["address"]
+        if address != "N/A":
+            return _same_address(address, page_address)
+
+    return True
+
+
+def _find_listing_model(document, listing_id=None, page_address=None):
+    """
+    Walk a decoded document breadth-first for the object that looks like the listing itself.
+
+    The shallowest match wins, so the page's own listing beats the similar and nearby
+    listings nested under it. Candidates whose ID or address contradicts the page's
+    listing URL or meta description are skipped.
+    """
+    nodes = deque([document])
+
+    while nodes:
+        node = nodes.popleft()
+        if isinstance(node, dict):
+            if _is_listing_model(node):
+                if _model_matches_page(node, listing_id, page_address):
+                    return node
+                continue  # Don't descend into another home's model
+            nodes.extend(node.values())
+        elif isinstance(node, list):
+            nodes.extend(node)
+
+    return None
+
+
+def _format_number(value):
+    """Render 4500000 / 4500000.0 / "4500000" as "4,500,000"; None for non-numbers."""
+    try:
+        number = float(str(value).replace(",", "").replace("$", ""))
+    except (TypeError, ValueError):
+        return None
+    return f"{int(number):,}" if number.is_integer() else f"{number:,}"
+
+
+def map_listing_model(model):
+    """
+    Map a Compass listing model (or schema.org listing) onto the listing field dict.
+
+    Fields the model does not carry are left as "N/A" / empty so the caller can
+    fill them from the DOM.
+    """
+    fields = {
+        "price": "N/A", "address": "N/A", "beds": "N/A", "baths": "N/A", "sqft": "N/A",
+        "description": "N/A", "listing_agents": "", "agent_company": "", "image_urls": []
+    }
+
+    location = model.get("location") or model.get("address") or {}
+    if isinstance(location, dict):
+        street = location.get("prettyAddress") or location.get("streetAddress")
+        city = location.get("city") or location.get("addressLocality")
+        state = location.get("state") or location.get("addressRegion")
+        zip_code = location.get("zipCode") or location.get("postalCode")
+        if street:
+            locality = " ".join(part for part in (state, zip_code) if part)
+            fields["address"] = ", ".join(part for part in (street, city, locality) if part)
+
+    price = model.get("price")
+    if isinstance(price, dict):
+        price = price.get("lastKnown") or price.get("listed") or price.get("formatted")
+    if price is None and isinstance(model.get("offers"), dict):
+        price = model["offers"].get("price")
+    price_text = _format_number(price)
+    if price_text:
+        fields["price"] = f"${price_text}"
+
+    size = model.get("size") if isinstance(model.get("size"), dict) else model
+    for field, keys in (("beds", ("bedrooms", "numberOfBedrooms")),
+                        ("baths", ("totalBathrooms", "bathrooms", "numberOfBathroomsTotal")),
+                        ("sqft", ("squareFeet", "floorSize"))):
+        for key in keys:
+            value = size.get(key)
+            if isinstance(value, dict):
+                value = value.get("value")
+            formatted = _format_number(value)
+            if formatted:
+                # Beds/baths are whole numbers on the meta description too
+                fields[field] = formatted.split(".")[0] if field != "sqft" else formatted
+                break
+
+    description = model.get("description")
+    if isinstance(description, str) and description.strip():
+        fields["description"] = " ".join(description.split())
+
+    agent_names, agent_companies = [], []
+    for agent in model.get("listingAgents") or model.get("agents") or []:
+        if not isinstance(agent, dict):
+            continue
+        name = agent.get("name") or agent.get("displayName")
+        company = agent.get("company") or agent.get("companyName") or agent.get("brokerage")
+        if isinstance(company, dict):
+            company = company.get("name")
+        if name and name not in agent_names:
+            agent_names.append(name)
+            agent_companies.append(company or "")
+    fields["listing_agents"] = "; ".join(agent_names)
+    fields["agent_company"] = "; ".join(agent_companies)
+
+    media = model.get("media") or model.get("photos") or model.get("image") or []
+    if isinstance(media, str):
+        media = [media]
+    for item in media:
+        url = item
+        if isinstance(item, dict):
+            url = item.get("originalUrl") or item.get("url")
+        if isinstance(url, str):
+            fields["image_urls"].append(url)
+    fields["image_urls"] = normalize_image_urls(fields["image_urls"])
+
+    return fields
+
+
+def parse_listing_html(html, listing_url=None):
+    """
+    Parse raw detail-page HTML into listing fields (see parse_listing_page).
+
+    The embedded page-state JSON is decoded first; the BeautifulSoup selectors only
+    run when it is absent or leaves fields unfilled. The JSON model is only trusted
+    when it agrees with the listing ID in `listing_url` and the meta description address.
+    """
+    id_match = LISTING_ID_PATTERN.search(listing_url or "")
+    meta_match = META_DESCRIPTION_PATTERN.search(html)
+    page_address = parse_meta_description(meta_match.group(1))[0] if meta_match else None
+
+    fields = None
+    for document in extract_page_state(html):
+        model = _find_listing_model(document, id_match.group(1) if id_match else None, page_address)
+        if model:
+            fields = map_listing_model(model)
+            break
+
+    missing = [key for key, value in (fields or {}).items() if value in ("N/A", "", [])]
+    if fields and not missing:
+        return fields
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    try:
+        soup_fields = parse_listing_page(soup)
+    finally:
+        soup.decompose()  # Break the tree's reference cycles now instead of at the next GC pass
+    if not fields:
+        return soup_fields
+
+    for key in missing:
+        fields[key] = soup_fields[key]
+    # Agent names and companies are paired, so take them from the same source
+    if "listing_agents" in missing or "agent_company" in missing:
+        fields["listing_agents"] = soup_fields["listing_agents"]
+        fields["agent_company"] = soup_fields["agent_company"]
+
+    return fields
+
+
+def parse_non_compass_agent_text(container_text):
+    """
+    Split the text of a non-Compass "Listed by" container into agent and company.
+
+    Returns:
+        tuple: (agent_name, company_name), or (None, None) if no pattern matched
+    """
+    # Try different patterns to extract agent and raw company
+    patterns = [
+        r"Listed by\s*\|\s*(.*?)\s*•\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Listed by | Agent • Company"
+        r"([^•·|]+)(?:•|·)\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Agent • Company" or "Agent · Company"
+        r"Listed by\s+(.*?)\s*·\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Listed by Agent · Company"
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, container_text)
+        if match:
+            agent_name = match.group(1).strip()
+            company_name = match.group(2).strip()
+
+            # Clean up "Listed by" if present
+            if "Listed by" in agent_name:
+                agent_name = agent_name.replace("Listed by", "").strip()
+
+            # Remove any remaining non-alphanumeric characters at the end of company name
+            company_name = re.sub(r'[^\w\s&\'-]+$', '', company_name).strip()
+
+            return agent_name, company_name
+
+    return None, None
+
+
+def parse_listed_by_text(agent_text):
+    """
+    Parse the older "Listed by Agent · Company | contact" text block.
+
+    Returns:
+        tuple: (agent_name, company_name), or (None, None) if it does not match
+    """
+    match = re.search(r"Listed by (.+?) · (.+)", agent_text)
+    if not match:
+        return None, None
+
+    agent_name, company_name = match.groups()
+
+    # Clean company name to remove contact info
+    company_name = re.sub(r'\s*\|.*$', '', company_name).strip()
+
+    return agent_name.strip(), company_name
+
+
+def extract_non_compass_agents(listing_soup):
+    """Extract non-Compass agent information with better company name handling."""
+    agents = []
+    companies = []
+
+    try:
+        # Look for the container with non-Compass agents
+        containers = listing_soup.select(
+            "li[data-tn='listing-page-listed-by-agents'], div.non-compass-contact-agent-slat__StyledSlatContainer-sc-10f1rjd-0")
+
+        for container in containers:
+            container_text = container.get_text(strip=True)
+            print(f"🔍 Found non-Compass container: {container_text}")
+
+            agent_name, company_name = parse_non_compass_agent_text(container_text)
+
+            if agent_name and company_name:
+                agents.append(agent_name)
+                companies.append(company_name)
+                print(f"✅ Extracted: Agent = '{agent_name}', Company = '{company_name}'")
+
+    except Exception as e:
+        print(f"❌ Error extracting non-Compass agents: {e}")
+
+    return agents, companies
+
+
+def extract_agents(driver, listing_soup):
+    """Extract both Compass and non-Compass agent information."""
+    agent_names = []
+    agent_companies = []
+
+    try:
+        # Method 1: Extract Compass agents using original selectors
+        compass_agents = listing_soup.select("a[data-tn='contactAgent-link-name']")
+        compass_companies = listing_soup.select("p.textIntent-caption1")
+
+        for agent, company in zip(compass_agents, compass_companies):
+            agent_name = agent.get_text(strip=True)
+            agent_company = company.get_text(strip=True).replace("Listed By ", "").strip()
+
+            if agent_name and not any(name == agent_name for name in agent_names):
+                agent_names.append(agent_name)
+                agent_companies.append(agent_company)
+
+        print(f"✅ Found {len(agent_names)} Compass agents")
+
+        # Method 2: Extract non-Compass agents using our improved function
+        non_compass_names, non_compass_companies = extract_non_compass_agents(listing_soup)
+
+        # Add non-duplicate non-Compass agents
+        for name, company in zip(non_compass_names, non_compass_companies):
+            if name and not any(existing == name for existing in agent_names):
+                agent_names.append(name)
+                agent_companies.append(company)
+                print(f"✅ Added non-Compass agent: {name} ({company})")
+
+        # Fallback Method 3: Try the old implementation if no non-Compass agents were found
+        if not non_compass_names:
+            non_compass_agents = listing_soup.find_all("div", string=re.compile(r"Listed by"))
+            for agent_block in non_compass_agents:
+                agent_name, company_name = parse_listed_by_text(agent_block.get_text(strip=True))
+                if agent_name and not any(existing == agent_name for existing in agent_names):
+                    agent_names.append(agent_name)
+                    agent_companies.append(company_name)
+                    print(f"✅ Old method found agent: {agent_name} ({company_name})")
+
+        return agent_names, agent_companies
+
+    except Exception as e:
+        print(f"❌ Error in extract_agents: {e}")
+        return agent_names, agent_companies  # Return whatever we found before the error
+
+
+def extract_county_from_url(listing_url, address):
+    """
+    Look up the county of a listing from the ZIP (or "City, ST") in its address or URL.
+
+    Uses the bundled county index (see county_index.py), which covers every US county.
+    """
+    county_name = county_index.lookup(address, listing_url) or "Unknown County"
+    print(f"📍 Extracted county: {county_name} from {listing_url}")
+    return county_name
@@ -0,0 +1,220 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+LISTING_STORE_PATH = "listing_state.db"
+
+# Processing stages tracked per listing, in pipeline order
+STAGES = ("scraped", "uploaded", "captioned", "saved")
+
+# Fields produced by later stages that survive a re-scrape of unchanged content
+STAGE_OUTPUT_FIELDS = ("instagram_caption", "uploaded_images")
+
+
+def listing_key(listing_url):
+    """Key listings by their Compass listing ID when the URL carries one, else by URL."""
+    match = re.search(r"/listing/[^/]+/(\d+)/?", listing_url or "")
+    return match.group(1) if match else listing_url
+
+
+def address_key(address):
+    """Normalise an address for lookups: case, punctuation and spacing differences don't matter."""
+    return " ".join(re.sub(r"[^\w\s]", " ", address.lower()).split())
+
+
+def content_hash(listing):
+    """Hash the fields that matter downstream: price, description, agents and the image URL set."""
+    content = {
+        "price": listing.get("price"),
+        "description": listing.get("description"),
+        "listing_agents": listing.get("listing_agents"),
+        "agent_company": listing.get("agent_company"),
+        "image_urls": sorted(set(listing.get("image_urls") or [])),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ListingStore:
+    """
+    Local SQLite record of every listing we have processed.
+
+    Each row keeps the listing's content hash, its last scraped record and a
+    timestamp per processing stage. Stage timestamps are cleared whenever the
+    content hash changes, so a stage counts as done only for the current content.
+    A second table caches which listing URL an address search resolved to.
+    """
+
+    def __init__(self, path=LISTING_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS listings (
+                    listing_key TEXT PRIMARY KEY,
+                    listing_url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    first_seen_at REAL NOT NULL,
+                    changed_at REAL NOT NULL,
+                    scraped_at REAL,
+                    uploaded_at REAL,
+                    captioned_at REAL,
+                    saved_at REAL
+                )
+            """)
+            self._add_missing_columns({"card_hash": "TEXT"})
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS addresses (
+                    address_key TEXT PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    listing_url TEXT NOT NULL,
+                    resolved_at REAL NOT NULL
+                )
+            """)
+
+    def _add_missing_columns(self, columns):
+        """Bring older databases up to the current schema."""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(listings)")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE listings ADD COLUMN {name} {column_type}")
+
+    def _row(self, listing_url):
+        return self._conn.execute(
+            "SELECT * FROM listings WHERE listing_key = ?", (listing_key(listing_url),)
+        ).fetchone()
+
+    def get_record(self, listing_url):
+        """Return the last stored listing dict for a URL, or None if we have never seen it."""
+        with self._lock:
+            row = self._row(listing_url)
+        return json.loads(row["record"]) if row else None
+
+    def record_scrape(self, listing):
+        """
+        Store a freshly scraped listing.
+
+        Returns:
+            bool: True if the listing is new or its content hash changed since the last run
+        """
+        now = time.time()
+        new_hash = content_hash(listing)
+
+        with self._lock, self._conn:
+            row = self._row(listing["listing_url"])
+
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO listings (listing_key, listing_url, content_hash, record, first_seen_at, "
+                    "changed_at, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (listing_key(listing["listing_url"]), listing["listing_url"], new_hash,
+                     json.dumps(listing), now, now, now)
+                )
+                return True
+
+            if row["content_hash"] != new_hash:
+                # Content changed - every downstream stage has to run again
+                self._conn.execute(
+                    "UPDATE listings SET listing_url = ?, content_hash = ?, record = ?, changed_at = ?, "
+                    "scraped_at = ?, uploaded_at = NULL, captioned_at = NULL, saved_at = NULL "
+                    "WHERE listing_key = ?",
+                    (listing["listing_url"], new_hash, json.dumps(listing), now, now, row["listing_key"])
+                )
+                return True
+
+            # Unchanged - keep stage timestamps and the fields later stages produced
+            stored = json.loads(row["record"])
+            record = dict(listing)
+            record.update({key: stored[key] for key in STAGE_OUTPUT_FIELDS if key in stored})
+            self._conn.execute(
+                "UPDATE listings SET record = ?, scraped_at = ? WHERE listing_key = ?",
+                (json.dumps(record), now, row["listing_key"])
+            )
+            return False
+
+    def record_card(self, listing_url, card_hash):
+        """Remember the search card a listing was last scraped from."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE listings SET card_hash = ? WHERE listing_key = ?",
+                               (card_hash, listing_key(listing_url)))
+
+    def card_unchanged(self, card):
+        """
+        Check a search card against what we hold.
+
+        Returns:
+            dict: The stored listing record if we have scraped this listing before and
+                its card looks exactly the same, else None (the detail page is needed)
+        """
+        with self._lock:
+            row = self._row(card["listing_url"])
+        if row and row["card_hash"] == card["card_hash"]:
+            return json.loads(row["record"])
+        return None
+
+    def get_listing_url(self, address, max_age=None):
+        """Return the listing URL an address was resolved to before (within `max_age` seconds), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT listing_url, resolved_at FROM addresses WHERE address_key = ?", (address_key(address),)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row["resolved_at"] > max_age):
+            return None
+        return row["listing_url"]
+
+    def forget_address(self, address):
+        """Drop a cached address whose listing URL went stale (delisted, or relisted under a new ID)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM addresses WHERE address_key = ?", (address_key(address),))
+
+    def remember_address(self, address, listing_url):
+        """Cache the listing URL a Compass address search resolved to."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO addresses (address_key, address, listing_url, resolved_at) "
+                "VALUES (?, ?, ?, ?)",
+                (address_key(address), address, listing_url, time.time())
+            )
+
+    def stage_done(self, listing_url, stage):
+        """Check whether a stage has already run for the listing's current content."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        with self._lock:
+            row = self._row(listing_url)
+        return bool(row and row[f"{stage}_at"])
+
+    def pending_stages(self, listing_url, stages=STAGES):
+        """Return the subset of `stages` that still has to run for a listing."""
+        return [stage for stage in stages if not self.stage_done(listing_url, stage)]
+
+    def mark_stage(self, listing_url, stage, **record_updates):
+        """Timestamp a completed stage, optionally saving fields it produced (e.g. the caption)."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        with self._lock, self._conn:
+            row = self._row(listing_url)
+            if row is None:
+                return
+
+            record = json.loads(row["record"])
+            record.update(record_updates)
+            self._conn.execute(
+                f"UPDATE listings SET {stage}_at = ?, record = ? WHERE listing_key = ?",
+                (time.time(), json.dumps(record), row["listing_key"])
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ✅ Shared store for the scraper and main pipeline
+listing_store = ListingStore()
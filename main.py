@@ -1,10 +1,11 @@
-from scraper import scrape_listings, scrape_specific_listing
+from scraper import iter_county_listings, scrape_specific_listing
 from drive_uploader import create_drive_folder, upload_image_to_drive, authenticate_google_drive
 from google_sheets import save_to_google_sheets
-from instagram_captions import generate_instagram_post
+from listing_store import listing_store
 from config import SKIP_IMAGE_UPLOAD, IMAGE_ONLY_MODE, GOOGLE_DRIVE_FOLDER_ID
 import time
 import random
+import argparse
 
 
 def get_existing_drive_folders():
@@ -126,40 +127,38 @@ def check_address_exists(address, existing_folders, existing_folder_variants):
 def process_missing_folder_images():
     """
     Process listings that don't have folders in Google Drive.
-    This implementation gets all current listings, then checks for missing folders.
+    Listings are streamed from the scraper, so each missing folder is uploaded
+    while the remaining detail pages are still being scraped.
     """
-    # First, get all current listings
-    print("🔍 Scraping current listings to identify missing folders...")
-    all_listings = scrape_listings()
-    print(f"📋 Found {len(all_listings)} current listings")
-
     # Get existing folders in Google Drive
     existing_folders, existing_folder_variants = get_existing_drive_folders()
 
-    # Find listings that don't have folders
-    missing_folders = []
+    print("🔍 Scraping current listings to identify missing folders...")
+
     duplicate_check = set()  # Avoid processing the same address twice
+    listing_count = 0
+    processed_count = 0
 
-    for listing in all_listings:
+    for listing in iter_county_listings():
+        listing_count += 1
         address = listing.get("address")
         if not address or address == "N/A" or address in duplicate_check:
             continue
 
         duplicate_check.add(address)
 
+        # The scraper uploads new listings itself; the folder list above predates those uploads
+        if listing_store.stage_done(listing["listing_url"], "uploaded"):
+            print(f"⏭️ Images already uploaded for: {address}")
+            continue
+
         # Check if this address already has a folder
         folder_id = check_address_exists(address, existing_folders, existing_folder_variants)
 
         if folder_id:
             print(f"🔍 Found existing folder for: {address}")
-        else:
-            missing_folders.append(listing)
-
-    print(f"🔍 Found {len(missing_folders)} listings without existing folders")
+            continue
 
-    # Process only the missing folders
-    processed_count = 0
-    for listing in missing_folders:
         try:
             address = listing["address"]
             print(f"\n🖼️ Processing images for: {address}")
@@ -182,6 +181,7 @@ def process_missing_folder_images():
                 if url:
                     uploaded_urls.append(url)
 
+            listing_store.mark_stage(listing["listing_url"], "uploaded", uploaded_images=uploaded_urls)
             print(f"✅ Uploaded {len(uploaded_urls)} images for: {address}")
             processed_count += 1
 
@@ -191,10 +191,11 @@ def process_missing_folder_images():
         except Exception as e:
             print(f"❌ Error processing images for {address}: {e}")
 
+    print(f"📋 Found {listing_count} current listings")
     return processed_count
 
 
-def main():
+def main(resume=False):
     if IMAGE_ONLY_MODE:
         print("🖼️ Running in IMAGE_ONLY_MODE - processing only listings without existing folders")
 
@@ -205,14 +206,22 @@ def main():
             print("⚠️ SKIP_IMAGE_UPLOAD is True, but running in IMAGE_ONLY_MODE - no actions performed")
 
     else:
-        # Regular full processing flow
-        listings = scrape_listings()
+        # Regular full processing flow - listings are processed as soon as they are scraped
         processed_listings = []  # ✅ Store processed listings to prevent duplicate updates
+        required_stages = ["captioned", "saved"] if SKIP_IMAGE_UPLOAD else ["uploaded", "captioned", "saved"]
+        skipped_count = 0
+
+        for listing in iter_county_listings(resume=resume):
+            # ✅ Skip listings whose content is unchanged and already went through every stage
+            pending_stages = listing_store.pending_stages(listing["listing_url"], required_stages)
+            if not pending_stages:
+                print(f"⏭️ Skipping unchanged listing: {listing['address']}")
+                skipped_count += 1
+                continue
 
-        for listing in listings:
             # ✅ Only create a folder and upload images if SKIP_IMAGE_UPLOAD is False
             listing_folder_id = None
-            if not SKIP_IMAGE_UPLOAD:
+            if "uploaded" in pending_stages:
                 # Get existing folders to check if this listing already has one
                 existing_folders, existing_folder_variants = get_existing_drive_folders()
                 folder_id = check_address_exists(listing["address"], existing_folders, existing_folder_variants)
@@ -232,16 +241,9 @@ def main():
                 ]
                 # Store uploaded image URLs
                 listing["uploaded_images"] = uploaded_images
+                listing_store.mark_stage(listing["listing_url"], "uploaded", uploaded_images=uploaded_images)
 
-            # ✅ Always generate captions
-            print(f"⏳ Generating caption for: {listing['address']}...")
-            listing["instagram_caption"] = generate_instagram_post(
-                listing["description"], listing["price"], listing["beds"],
-                listing["baths"], listing["sqft"], listing["address"],
-                listing.get("listing_agents"), listing.get("agent_company")
-            )
-            print(f"✅ Caption generated for: {listing['address']}")
-            time.sleep(random.uniform(2, 5))  # ✅ Prevents OpenAI rate-limiting
+            # ✅ The scraper already captioned the listing (with agent credit) and marked the stage
 
             # ✅ Add listing to processed list to avoid duplicates
             processed_listings.append(listing)
@@ -250,8 +252,13 @@ def main():
         sheet_name = "Real_Estate_Faceless"
         print(f"📤 Uploading data to Google Sheet: {sheet_name}")
         save_to_google_sheets(processed_listings, sheet_name)  # ✅ Pass processed listings
-        print("✅ Data successfully saved!")
+        for listing in processed_listings:
+            listing_store.mark_stage(listing["listing_url"], "saved")
+        print(f"✅ Data successfully saved! ({skipped_count} unchanged listings skipped)")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape Compass listings and publish them to Drive and Sheets.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last interrupted scrape from its checkpoint instead of starting over")
+    main(resume=parser.parse_args().resume)
\ No newline at end of file
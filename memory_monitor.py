@@ -0,0 +1,144 @@
+import os
+import threading
+
+try:
+    import psutil
+except ImportError:  # Fall back to /proc on Linux; elsewhere memory sampling is simply off
+    psutil = None
+
+MB = 1024 * 1024
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _proc_children(pid):
+    """Direct and indirect children of a process, read from /proc."""
+    parents = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return []
+
+    for child in pids:
+        try:
+            with open(f"/proc/{child}/stat") as f:
+                # The command name may contain spaces, so split after its closing paren
+                parents.setdefault(int(f.read().rsplit(")", 1)[1].split()[1]), []).append(child)
+        except (OSError, IndexError, ValueError):
+            continue
+
+    children, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            children.append(child)
+            stack.append(child)
+    return children
+
+
+def process_rss(pid=None):
+    """Resident memory of a process in bytes (this process by default), or None if unavailable."""
+    pid = pid or os.getpid()
+    if psutil:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    return _proc_rss(pid)
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory of a process and all of its descendants in bytes.
+
+    For a driver this is chromedriver plus the browser, GPU and renderer processes.
+    """
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue  # Renderer exited between listing and sampling
+        return total
+
+    rss = _proc_rss(pid)
+    if rss is None:
+        return None
+    return rss + sum(_proc_rss(child) or 0 for child in _proc_children(pid))
+
+
+class MemoryMonitor:
+    """
+    Samples Python and browser memory after each page and keeps the run's peaks.
+
+    Browser memory is tracked per driver (by its chromedriver PID) so the driver
+    pool can recycle the one that grew; the peak browser figure is the largest
+    combined footprint of all drivers seen at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._browser_rss = {}
+        self.reset()
+
+    def reset(self):
+        """Start a new run's peak figures."""
+        with self._lock:
+            self.samples = 0
+            self.peak_python_rss = 0
+            self.peak_browser_rss = 0
+            self._browser_rss.clear()
+
+    def sample(self, browser_pid=None):
+        """
+        Sample this process and, if given, one driver's process tree.
+
+        Returns:
+            int: The driver's resident memory in bytes, or None if it could not be read
+        """
+        python_rss = process_rss()
+        browser_rss = process_tree_rss(browser_pid) if browser_pid else None
+
+        with self._lock:
+            self.samples += 1
+            if python_rss:
+                self.peak_python_rss = max(self.peak_python_rss, python_rss)
+            if browser_rss:
+                self._browser_rss[browser_pid] = browser_rss
+                self.peak_browser_rss = max(self.peak_browser_rss, sum(self._browser_rss.values()))
+
+        return browser_rss
+
+    def forget(self, browser_pid):
+        """Stop counting a driver that has quit."""
+        with self._lock:
+            self._browser_rss.pop(browser_pid, None)
+
+    def report(self):
+        """Print the run's peak memory."""
+        if not self.samples:
+            return
+        if not (self.peak_python_rss or self.peak_browser_rss):
+            print("⚠️ Memory sampling unavailable (install psutil)")
+            return
+        print(f"🧠 Peak memory: Python {self.peak_python_rss / MB:.0f} MB, "
+              f"browsers {self.peak_browser_rss / MB:.0f} MB over {self.samples} pages")
+
+
+# ✅ Shared monitor for the driver pool and scrape runs
+memory_monitor = MemoryMonitor()
@@ -0,0 +1,131 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+PAGE_CACHE_DIR = ".page_cache"
+PAGE_CACHE_TTL = 6 * 60 * 60  # Seconds a cached page is served without revalidation
+PAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Compressed size cap before LRU eviction
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages, keyed by URL and variant.
+
+    Bodies are zlib-compressed files; a small SQLite index keeps the HTTP
+    validators (ETag / Last-Modified), fetch and access times and sizes. Entries
+    younger than `ttl` are fresh; older ones can be revalidated with a
+    conditional request. The least recently used entries are evicted once the
+    total compressed size passes `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=PAGE_CACHE_DIR, ttl=PAGE_CACHE_TTL, max_bytes=PAGE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    cache_key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def _key(url, variant):
+        return hashlib.sha1(f"{variant}:{url}".encode("utf-8")).hexdigest()
+
+    def get(self, url, variant="html"):
+        """
+        Look up a cached page.
+
+        Returns:
+            dict: {"body", "etag", "last_modified", "fresh"}, or None on a miss
+        """
+        cache_key = self._key(url, variant)
+
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM pages WHERE cache_key = ?", (cache_key,)).fetchone()
+            if row is None:
+                return None
+
+            try:
+                with open(os.path.join(self.cache_dir, row["filename"]), "rb") as f:
+                    body = zlib.decompress(f.read()).decode("utf-8")
+            except (OSError, zlib.error) as e:
+                print(f"⚠️ Dropping unreadable cache entry for {url}: {e}")
+                self._delete(row)
+                return None
+
+            with self._conn:
+                self._conn.execute("UPDATE pages SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+
+        return {
+            "body": body,
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "fresh": time.time() - row["fetched_at"] < self.ttl,
+        }
+
+    def put(self, url, body, variant="html", etag=None, last_modified=None):
+        """Store a page body, then evict least recently used entries past the size cap."""
+        cache_key = self._key(url, variant)
+        filename = f"{cache_key}.z"
+        data = zlib.compress(body.encode("utf-8"), 6)
+        now = time.time()
+
+        with self._lock:
+            with open(os.path.join(self.cache_dir, filename), "wb") as f:
+                f.write(data)
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (cache_key, url, variant, filename, etag, last_modified, "
+                    "fetched_at, last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, url, variant, filename, etag, last_modified, now, now, len(data))
+                )
+
+            self._evict()
+
+    def refresh(self, url, variant="html"):
+        """Mark a cached page fresh again after the server answered 304 Not Modified."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE cache_key = ?",
+                               (time.time(), self._key(url, variant)))
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for row in self._conn.execute("SELECT * FROM pages ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._delete(row)
+            total -= row["size"]
+
+    def _delete(self, row):
+        with self._conn:
+            self._conn.execute("DELETE FROM pages WHERE cache_key = ?", (row["cache_key"],))
+        try:
+            os.remove(os.path.join(self.cache_dir, row["filename"]))
+        except OSError:
+            pass
+
+
+# ✅ Shared cache for the scraper's page fetches
+page_cache = PageCache()
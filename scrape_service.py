@@ -0,0 +1,273 @@
+import json
+import time
+import queue
+import argparse
+import threading
+import itertools
+import collections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scraper import driver_pool, fetch_address_listing, scrape_listing_details
+from google_sheets import authenticate_google_sheets, save_to_google_sheets
+from instagram_captions import get_openai_client
+from listing_store import listing_store
+from config import SKIP_IMAGE_UPLOAD, USE_MOCK_OPENAI
+
+SERVICE_HOST = "127.0.0.1"  # Local only: the API has no authentication
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2  # Jobs processed at once (each leases a pooled driver only when the HTTP fast path fails)
+SERVICE_WARM_DRIVERS = 1  # Browsers started before the first request arrives
+SERVICE_SHEET_NAME = "Real_Estate_Faceless"
+SERVICE_MAX_FINISHED_JOBS = 500  # Finished jobs kept for status queries, oldest dropped first
+
+# Job status flow: queued → resolving (addresses only) → scraping (and captioning) → saving → done | failed
+FINISHED_STATUSES = ("done", "failed")
+
+
+class ScrapeService:
+    """
+    Keeps warm browsers and authenticated Drive, Sheets and OpenAI clients (Drive is
+    authenticated once, when drive_uploader is imported) and runs queued single-listing
+    jobs through the pipeline: resolve the address, scrape the detail page, upload
+    images, caption and save the row to Google Sheets.
+
+    Jobs live in memory; the listing store still records every stage, so a job for
+    a listing that was already processed only redoes the stages its content needs.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, sheet_name=SERVICE_SHEET_NAME):
+        self.workers = workers
+        self.sheet_name = sheet_name
+        self.started_at = time.time()
+        self._jobs = collections.OrderedDict()
+        self._active = {}  # (kind, target) → job id, so a repeated request joins the running job
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sheets_lock = threading.Lock()  # Appends from two workers could race for the same row
+        self._queue = queue.Queue()
+        self._sheets_client = None
+
+    def start(self, warm_drivers=SERVICE_WARM_DRIVERS):
+        """Authenticate the API clients, warm the driver pool and start the job workers."""
+        print("⏳ Warming up scrape service...")
+        self._sheets_client = authenticate_google_sheets()
+        print("✅ Google Sheets client ready")
+        if not USE_MOCK_OPENAI:
+            get_openai_client()
+            print("✅ OpenAI client ready")
+        if warm_drivers:
+            driver_pool.warm(warm_drivers)
+
+        for number in range(self.workers):
+            threading.Thread(target=self._worker, name=f"scrape-job-{number + 1}", daemon=True).start()
+
+    def enqueue(self, kind, target):
+        """
+        Queue an "address" or "listing_url" job.
+
+        Returns:
+            dict: The job's status (the already queued or running job for the same target, if any)
+        """
+        target = target.strip()
+        with self._lock:
+            job_id = self._active.get((kind, target))
+            if job_id is not None:
+                return dict(self._jobs[job_id])
+
+            now = time.time()
+            job = {
+                "id": str(next(self._ids)),
+                "kind": kind,
+                "target": target,
+                "status": "queued",
+                "listing_url": target if kind == "listing_url" else None,
+                "created_at": now,
+                "updated_at": now,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            self._active[(kind, target)] = job["id"]
+            self._prune()
+
+        self._queue.put(job["id"])
+        print(f"📥 Queued job {job['id']}: {kind} {target}")
+        return dict(job)
+
+    def job(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def jobs(self):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def status(self):
+        with self._lock:
+            counts = collections.Counter(job["status"] for job in self._jobs.values())
+        return {"uptime": round(time.time() - self.started_at), "queued": self._queue.qsize(),
+                "workers": self.workers, "jobs": dict(counts)}
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(changes, updated_at=time.time())
+            if job["status"] in FINISHED_STATUSES:
+                self._active.pop((job["kind"], job["target"]), None)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in FINISHED_STATUSES]
+        for job_id in finished[:max(0, len(finished) - SERVICE_MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception as e:
+                print(f"❌ Job {job_id} failed: {e}")
+                self._update(job_id, status="failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id):
+        job = self.job(job_id)
+        start = time.time()
+
+        listing_url, fields = job["listing_url"], None
+        if job["kind"] == "address":
+            self._update(job_id, status="resolving")
+            listing_url, fields = fetch_address_listing(job["target"])
+            if listing_url is None:
+                self._update(job_id, status="failed", error="No Compass listing found for this address")
+                return
+
+        # Scrapes the page (unless resolving the address already did), uploads images (unless
+        # SKIP_IMAGE_UPLOAD) and captions it, each only if the current content still needs it
+        self._update(job_id, status="scraping", listing_url=listing_url)
+        listing = scrape_listing_details(listing_url, fields)
+
+        self._update(job_id, status="saving")
+        with self._sheets_lock:
+            save_to_google_sheets([listing], self.sheet_name, client=self._sheets_client)
+        listing_store.mark_stage(listing_url, "saved")
+
+        record = listing_store.get_record(listing_url) or {}
+        listing["uploaded_images"] = record.get("uploaded_images", [])
+        self._update(job_id, status="done", result=listing)
+        print(f"✅ Job {job_id} done in {time.time() - start:.1f}s: {listing['address']}")
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API:
+        POST /jobs      {"address": ...} | {"listing_url": ...} | {"addresses": [...], "listing_urls": [...]}
+        GET  /jobs      every job still held
+        GET  /jobs/<id> one job's status and, once done, its listing
+        GET  /status    uptime, queue length and job counts by status
+    """
+
+    service = None  # Set by serve()
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/status":
+            self._reply(200, self.service.status())
+        elif path == "/jobs":
+            self._reply(200, {"jobs": self.service.jobs()})
+        elif path.startswith("/jobs/"):
+            job = self.service.job(path[len("/jobs/"):])
+            if job:
+                self._reply(200, job)
+            else:
+                self._reply(404, {"error": "Unknown job"})
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._reply(404, {"error": "Not found"})
+            return
+
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        except ValueError:
+            self._reply(400, {"error": "Body must be JSON"})
+            return
+        if not isinstance(body, dict):
+            self._reply(400, {"error": "Body must be a JSON object"})
+            return
+
+        targets = []
+        for kind, single_key, list_key in (("address", "address", "addresses"),
+                                           ("listing_url", "listing_url", "listing_urls")):
+            single, many = body.get(single_key), body.get(list_key)
+            if single is not None and not isinstance(single, str):
+                self._reply(400, {"error": f"{single_key} must be a string"})
+                return
+            if many is not None and not (isinstance(many, list) and all(isinstance(item, str) for item in many)):
+                self._reply(400, {"error": f"{list_key} must be a list of strings"})
+                return
+            targets += [(kind, target) for target in [single] + (many or []) if target and target.strip()]
+
+        if not targets:
+            self._reply(400, {"error": "Give an address, listing_url, addresses or listing_urls"})
+            return
+
+        for kind, target in targets:
+            if kind == "listing_url" and "/listing/" not in target:
+                self._reply(400, {"error": f"Not a Compass listing URL: {target}"})
+                return
+
+        self._reply(202, {"jobs": [self.service.enqueue(kind, target) for kind, target in targets]})
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def serve(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS, warm_drivers=SERVICE_WARM_DRIVERS,
+          sheet_name=SERVICE_SHEET_NAME):
+    """Start the service and block until interrupted."""
+    service = ScrapeService(workers, sheet_name)
+    service.start(warm_drivers)
+
+    ServiceRequestHandler.service = service
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    print(f"🚀 Scrape service listening on http://{host}:{port} "
+          f"({workers} workers, uploads {'off' if SKIP_IMAGE_UPLOAD else 'on'})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Shutting down scrape service")
+    finally:
+        server.server_close()
+        driver_pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a local service that keeps browsers and API clients warm and scrapes listings on request.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Jobs processed at once")
+    parser.add_argument("--warm-drivers", type=int, default=SERVICE_WARM_DRIVERS,
+                        help="Browsers to start before taking requests")
+    parser.add_argument("--sheet", default=SERVICE_SHEET_NAME, help="Google Sheet the listings are saved to")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.warm_drivers, args.sheet)
+
+
+if __name__ == "__main__":
+    main()
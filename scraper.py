@@ -1,22 +1,128 @@
 import time
 import random
+import json
+import atexit
 import re
-from bs4 import BeautifulSoup, Comment
+import queue
+import multiprocessing
+import collections
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse, urlunparse
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium_stealth import stealth
 from config import COMPASS_URL
+from listing_parser import (parse_listing_html, parse_search_cards, parse_price, map_dom_snapshot,
+                            extract_county_from_url)
+from listing_store import listing_store
+from checkpoint import ScrapeCheckpoint
+from memory_monitor import memory_monitor, MB
+from page_cache import page_cache
+from html_archive import archive_page
 from drive_uploader import create_drive_folder, upload_image_to_drive
 from instagram_captions import generate_instagram_post
 from config import SKIP_IMAGE_UPLOAD
 
 
+# Driver pool settings
+DRIVER_POOL_SIZE = 4  # Max Chrome instances alive at once
+DRIVER_MAX_PAGES = 25  # Recycle a driver after this many page loads
+DRIVER_MAX_RSS_MB = 1024  # Recycle a driver once Chrome's process tree grows past this (None disables)
+
+# Parallel scraping settings
+SCRAPE_WORKERS = 1  # Browser workers for listing detail pages (1 = sequential)
+HOST_MIN_INTERVAL = 1.0  # Minimum seconds between navigations to the same host, across all workers
+HOST_JITTER = 2.0  # Extra random spacing (0 to this many seconds) added per navigation
+
+# HTTP fast path settings
+USE_HTTP_FAST_PATH = True  # Fetch detail pages with requests first, Selenium only as a fallback
+HTTP_TIMEOUT = 15
+FAST_PATH_REQUIRED_FIELDS = ("address", "price", "description", "image_urls")
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+USE_PAGE_CACHE = True  # Serve listing pages from the on-disk cache (see page_cache.py for TTL and size cap)
+ARCHIVE_PAGES = True  # Keep every fetched detail page for offline reparsing (see html_archive.py)
+
+# Parse pipeline settings
+PARSE_WORKERS = None  # Processes parsing fast path HTML (None = CPU count)
+PARSE_PIPELINE_DEPTH = 2  # Pages a worker may have fetched but not yet finished
+# The pool starts from a worker thread while others run; a forked child could inherit a held lock (e.g. stdout's)
+PARSE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Search-card discovery: skip detail pages for listings whose card is unchanged since the last scrape
+CARD_DISCOVERY = True
+
+# Search space partitioning (see build_search_url)
+SEARCH_PAGE_SIZE = 41  # Cards per results page; page 2 of a search starts at start=41
+SEARCH_MAX_PAGES = 10  # Result pages read per partition before giving up on it
+PRICE_BANDS = None  # e.g. [(5_000_000, None), (3_000_000, 5_000_000), (None, 3_000_000)]; None = one partition
+PARTITION_WORKERS = 3  # Partitions crawled at once (each holds a pooled driver while it runs)
+
+# Counties scraped per run: a list of search URLs, or {county name: search URL} to name them explicitly
+COUNTY_SEARCH_URLS = [COMPASS_URL]
+COUNTY_WORKERS = 3  # County searches crawled at once
+COUNTY_SEARCH_SLUG_PATTERN = re.compile(r"^([a-z]+(?:-[a-z]+)*)-county-[a-z]{2}$")  # "montgomery-county-md"
+
+# Lookups by address (scrape_specific_listing / iter_specific_listings)
+SPECIFIC_LISTING_WORKERS = DRIVER_POOL_SIZE  # Addresses searched at once, each on a pooled driver
+ADDRESS_URL_TTL = 30 * 24 * 3600  # Seconds an address's cached listing URL is trusted before searching again
+
+# Early stop rules for the price-sorted search page (None disables a rule)
+MIN_PRICE = None  # Ignore listings below this price; the scan stops at the first cheaper card
+STOP_AFTER_KNOWN = None  # Stop the scan after this many consecutive unchanged, already-scraped cards
+
+# Multi-tab prefetch settings (browser-only runs, i.e. USE_HTTP_FAST_PATH = False)
+PREFETCH_TABS = 3  # Listing tabs loading at once per driver (1 disables prefetching)
+
+# Search results scrolling settings
+SCROLL_STEP_PX = 500  # Initial scroll distance per step
+SCROLL_MAX_STEP_PX = 2000  # Cap for the step size when cards load quickly
+SCROLL_MAX_STEPS = 60  # Hard stop for very long result pages
+SCROLL_IDLE_TIMEOUT = 2.5  # Seconds to wait for new cards after a scroll before giving up
+SCROLL_POLL_INTERVAL = 0.2
+
+# Page readiness settings
+PAGE_READY_TIMEOUT = 10  # Max seconds to wait for a page's readiness predicate
+AGENT_READY_TIMEOUT = 3  # Max seconds to wait for the agent slat after scrolling to it
+
+# Browser resource blocking settings
+BLOCK_RESOURCES = True  # Skip image bytes, fonts, media and third-party trackers in the scraping browser
+BLOCKED_URL_PATTERNS = [
+    # Images - we only need their URLs, which stay in the DOM attributes
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts and media
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    # Analytics, ads and tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googleadservices.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*segment.com*", "*segment.io*",
+    "*nr-data.net*", "*newrelic.com*", "*optimizely.com*", "*fullstory.com*", "*sentry.io*",
+    "*bing.com*", "*tiktok.com*", "*pinterest.com*", "*snapchat.com*", "*quantserve.com*",
+]
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path():
+    """Resolves the chromedriver binary once per process instead of on every launch."""
+    global _chromedriver_path
+
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
 def start_driver():
     """Starts a headless Selenium WebDriver."""
     chrome_options = Options()
@@ -25,13 +131,34 @@ def start_driver():
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--dns-prefetch-disable")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
 
     # Add additional options to make scraping more robust
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-dev-shm-usage")
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    if BLOCK_RESOURCES:
+        # Hand control back at DOMContentLoaded; readiness is checked with explicit waits
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+
+    driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=chrome_options)
+    configure_tab(driver)
+
+    return driver
+
+
+def configure_tab(driver):
+    """
+    Apply resource blocking and the stealth evasions to the driver's current tab.
+
+    Both go through DevTools commands that only reach the tab that is current when
+    they run, so every new tab needs this before it loads anything.
+    """
+    if BLOCK_RESOURCES:
+        block_resources(driver)
 
     stealth(driver,
             languages=["en-US", "en"],
@@ -42,176 +169,425 @@ def start_driver():
             fix_hairline=True,
             )
 
-    return driver
+
+def block_resources(driver):
+    """Blocks image, font, media and tracker requests for a driver via the DevTools protocol."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ Could not enable resource blocking: {e}")
+
+
+def driver_pid(driver):
+    """PID of the chromedriver process behind a driver (Chrome runs as its children), or None."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
 
 
-def wait_for_page_load(driver, timeout=10):
-    """Wait for the page to fully load with a timeout."""
+def is_driver_alive(driver):
+    """Cheap health check: a crashed or closed browser fails even a trivial script."""
     try:
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
+        driver.execute_script("return 1;")
         return True
-    except TimeoutException:
-        print("⚠️ Page load timeout - continuing anyway")
+    except Exception:
         return False
 
 
-def extract_non_compass_agents(listing_soup):
-    """Extract non-Compass agent information with better company name handling."""
-    agents = []
-    companies = []
+class DriverPool:
+    """
+    Keeps warm headless Chrome drivers that scraping entry points lease and return.
 
-    try:
-        # Look for the container with non-Compass agents
-        containers = listing_soup.select(
-            "li[data-tn='listing-page-listed-by-agents'], div.non-compass-contact-agent-slat__StyledSlatContainer-sc-10f1rjd-0")
-
-        for container in containers:
-            container_text = container.get_text(strip=True)
-            print(f"🔍 Found non-Compass container: {container_text}")
-
-            # First try to extract the agent name and raw company part
-            agent_name = None
-            company_name = None
-
-            # Try different patterns to extract agent and raw company
-            patterns = [
-                r"Listed by\s*\|\s*(.*?)\s*•\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Listed by | Agent • Company"
-                r"([^•·|]+)(?:•|·)\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Agent • Company" or "Agent · Company"
-                r"Listed by\s+(.*?)\s*·\s*(.*?)(?=\s*\||\s*P:|\s*Phone:|\s*$)",  # "Listed by Agent · Company"
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, container_text)
-                if match:
-                    agent_name = match.group(1).strip()
-                    company_name = match.group(2).strip()
-
-                    # Clean up "Listed by" if present
-                    if "Listed by" in agent_name:
-                        agent_name = agent_name.replace("Listed by", "").strip()
-
-                    # Remove any remaining non-alphanumeric characters at the end of company name
-                    company_name = re.sub(r'[^\w\s&\'-]+$', '', company_name).strip()
+    Drivers are health-checked before every lease and recycled once they have
+    loaded `max_pages` pages or their browser's memory passes `max_rss_mb`, so a
+    long run never leans on a stale or bloated browser.
+    """
 
-                    break
+    def __init__(self, max_size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss = max_rss_mb * MB if max_rss_mb else None
+        self._idle = []
+        self._page_counts = {}
+        self._oversized = set()
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def lease(self):
+        """Lease a driver for the duration of a `with` block."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
 
-            if agent_name and company_name:
-                agents.append(agent_name)
-                companies.append(company_name)
-                print(f"✅ Extracted: Agent = '{agent_name}', Company = '{company_name}'")
+    def warm(self, count=None):
+        """Start drivers up front (up to `count`, default the pool size) so the first leases don't wait on Chrome."""
+        drivers = []
+        try:
+            for _ in range(min(count or self.max_size, self.max_size)):
+                drivers.append(self.acquire())
+        finally:
+            for driver in drivers:
+                self.release(driver)
+        print(f"🔥 Driver pool warmed with {len(drivers)} browser(s)")
+
+    def should_recycle(self, driver):
+        """True once a leased driver has hit its page or memory limit, i.e. release() will quit it."""
+        with self._cond:
+            return self._page_counts.get(driver, 0) >= self.max_pages or driver in self._oversized
+
+    def count_page(self, driver):
+        """Record a page load against a leased driver and sample its memory."""
+        with self._cond:
+            self._page_counts[driver] = self._page_counts.get(driver, 0) + 1
+
+        browser_rss = memory_monitor.sample(driver_pid(driver))
+        if self.max_rss and browser_rss and browser_rss > self.max_rss:
+            with self._cond:
+                self._oversized.add(driver)
+
+    def close(self):
+        """Quit every idle driver and stop handing out new ones."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for driver in idle:
+            self._quit(driver)
+
+    def acquire(self):
+        """Take a healthy driver from the pool, starting one if there is room."""
+        while True:
+            with self._cond:
+                while not self._idle and self._live >= self.max_size:
+                    self._cond.wait()
+
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._live += 1
+                    driver = None
+
+            if driver is None:
+                break
 
-    except Exception as e:
-        print(f"❌ Error extracting non-Compass agents: {e}")
+            # Health check outside the lock so other workers aren't blocked on the RPC
+            if is_driver_alive(driver):
+                return driver
 
-    return agents, companies
+            print("⚠️ Pooled driver failed health check - replacing it")
+            self._quit(driver)
 
+        try:
+            driver = start_driver()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._page_counts[driver] = 0
+        return driver
+
+    def release(self, driver):
+        """Return a leased driver, quitting it if it has hit its page or memory limit."""
+        with self._cond:
+            pages = self._page_counts.get(driver, 0)
+            oversized = driver in self._oversized
+            if pages < self.max_pages and not oversized and not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+
+        if oversized:
+            print(f"♻️ Recycling driver after {pages} pages: browser memory passed {self.max_rss // MB} MB")
+        elif pages >= self.max_pages:
+            print(f"♻️ Recycling driver after {self.max_pages} pages")
+        self._quit(driver)
+
+    def _quit(self, driver):
+        with self._cond:
+            self._page_counts.pop(driver, None)
+            self._oversized.discard(driver)
+            self._live -= 1
+            self._cond.notify()
+
+        memory_monitor.forget(driver_pid(driver))
 
-def extract_agents(driver, listing_soup):
-    """Extract both Compass and non-Compass agent information."""
-    agent_names = []
-    agent_companies = []
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error quitting driver: {e}")
 
-    try:
-        # Method 1: Extract Compass agents using original selectors
-        compass_agents = listing_soup.select("a[data-tn='contactAgent-link-name']")
-        compass_companies = listing_soup.select("p.textIntent-caption1")
 
-        for agent, company in zip(compass_agents, compass_companies):
-            agent_name = agent.get_text(strip=True)
-            agent_company = company.get_text(strip=True).replace("Listed By ", "").strip()
+# ✅ Shared pool for every scraping entry point in this process
+driver_pool = DriverPool()
+atexit.register(driver_pool.close)
 
-            if agent_name and not any(name == agent_name for name in agent_names):
-                agent_names.append(agent_name)
-                agent_companies.append(agent_company)
 
-        print(f"✅ Found {len(agent_names)} Compass agents")
+class RateLimiter:
+    """
+    Spaces out navigations to each host, shared by every worker thread.
 
-        # Method 2: Extract non-Compass agents using our improved function
-        non_compass_names, non_compass_companies = extract_non_compass_agents(listing_soup)
+    This is the only politeness delay in the scraper; page waits are purely
+    condition-based.
+    """
 
-        # Add non-duplicate non-Compass agents
-        for name, company in zip(non_compass_names, non_compass_companies):
-            if name and not any(existing == name for existing in agent_names):
-                agent_names.append(name)
-                agent_companies.append(company)
-                print(f"✅ Added non-Compass agent: {name} ({company})")
+    def __init__(self, min_interval=HOST_MIN_INTERVAL, jitter=HOST_JITTER):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until the next request slot for the URL's host."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval + random.uniform(0, self.jitter)
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+rate_limiter = RateLimiter()
+
+
+def create_http_session():
+    """Creates a pooled requests session for fetching server-rendered pages."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DRIVER_POOL_SIZE * 2, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    return session
+
+
+http_session = create_http_session()
+
+
+# Runs inside the page and returns only what the extractors need, instead of
+# shipping the whole DOM back through driver.page_source
+LISTING_SNAPSHOT_JS = """
+const text = el => (el && el.textContent || '').replace(/\\s+/g, ' ').trim();
+const all = selector => Array.from(document.querySelectorAll(selector));
+const meta = document.querySelector('meta[name="description"]');
+const remarks = document.querySelector('div[data-tn="uc-listing-description"]');
+const hero = document.getElementById('media-gallery-hero-image');
+
+return {
+    meta_description: meta ? meta.getAttribute('content') : null,
+    description_spans: remarks ? Array.from(remarks.querySelectorAll('span'), text).filter(Boolean) : [],
+    compass_agents: all("a[data-tn='contactAgent-link-name']").map(text),
+    compass_companies: all('p.textIntent-caption1').map(text),
+    non_compass_agents: all("li[data-tn='listing-page-listed-by-agents'], " +
+                            "div.non-compass-contact-agent-slat__StyledSlatContainer-sc-10f1rjd-0").map(text),
+    listed_by_blocks: all('div').filter(d => d.childElementCount === 0 && d.textContent.includes('Listed by')).map(text),
+    hero_image: hero ? hero.getAttribute('src') : null,
+    carousel_images: all('img[data-flickity-lazyload-src]')
+        .map(img => img.getAttribute('data-flickity-lazyload-src')).filter(Boolean),
+    large_images: Array.from(document.images)
+        .filter(img => parseInt(img.getAttribute('width')) > 400 && parseInt(img.getAttribute('height')) > 400)
+        .map(img => img.getAttribute('src')).filter(Boolean),
+};
+"""
+
+
+# Scrolls the results container and reports the card count and whether we hit the bottom
+SCROLL_AND_COUNT_JS = """
+const container = arguments[0];
+container.scrollTop += arguments[1];
+return [document.querySelectorAll('div.uc-listingCard').length,
+        container.scrollTop + container.clientHeight >= container.scrollHeight - 2];
+"""
+LISTING_CARD_COUNT_JS = "return document.querySelectorAll('div.uc-listingCard').length;"
+# Markup of the cards from index arguments[0] on, so each card crosses the driver connection once
+LISTING_CARDS_HTML_JS = """
+return Array.from(document.querySelectorAll('div.uc-listingCard')).slice(arguments[0])
+            .map(card => card.outerHTML).join('');
+"""
+
+
+def scroll_listing_cards(driver, container, target_count=None, stop_when=None):
+    """
+    Scrolls the search results container until the listing cards stop loading.
 
-        # Fallback Method 3: Try the old implementation if no non-Compass agents were found
-        if not non_compass_names:
-            non_compass_agents = listing_soup.find_all("div", string=re.compile(r"Listed by"))
-            for agent_block in non_compass_agents:
-                agent_text = agent_block.get_text(strip=True)
-                match = re.search(r"Listed by (.+?) · (.+)", agent_text)
-                if match:
-                    agent_name, company_name = match.groups()
+    Stops as soon as the card count has not grown within SCROLL_IDLE_TIMEOUT of a
+    scroll at the bottom of the container (or twice in a row anywhere), once
+    `target_count` cards are present, or once `stop_when(card_count)` returns True.
+    The step size grows while cards keep arriving immediately, so fast pages are
+    harvested in a few scrolls.
 
-                    # Clean company name to remove contact info
-                    company_name = re.sub(r'\s*\|.*$', '', company_name).strip()
+    Returns:
+        int: Number of listing cards on the page
+    """
+    count = driver.execute_script(LISTING_CARD_COUNT_JS)
+    step_px = SCROLL_STEP_PX
+    stalled_steps = 0
+
+    for step in range(SCROLL_MAX_STEPS):
+        if target_count and count >= target_count:
+            break
+        if stop_when and stop_when(count):
+            break
+
+        new_count, at_bottom = driver.execute_script(SCROLL_AND_COUNT_JS, container, step_px)
+
+        # Poll for newly rendered cards instead of sleeping a fixed interval
+        waited = 0.0
+        while new_count <= count and waited < SCROLL_IDLE_TIMEOUT:
+            time.sleep(SCROLL_POLL_INTERVAL)
+            waited += SCROLL_POLL_INTERVAL
+            new_count = driver.execute_script(LISTING_CARD_COUNT_JS)
+
+        if new_count > count:
+            stalled_steps = 0
+            if waited <= SCROLL_POLL_INTERVAL:
+                step_px = min(step_px * 2, SCROLL_MAX_STEP_PX)
+        else:
+            stalled_steps += 1
+            if at_bottom or stalled_steps >= 2:
+                break
 
-                    if agent_name and not any(existing == agent_name.strip() for existing in agent_names):
-                        agent_names.append(agent_name.strip())
-                        agent_companies.append(company_name)
-                        print(f"✅ Old method found agent: {agent_name.strip()} ({company_name})")
+        count = new_count
 
-        return agent_names, agent_companies
+    print(f"📜 Loaded {count} listing cards after {step + 1} scrolls")
+    return count
 
-    except Exception as e:
-        print(f"❌ Error in extract_agents: {e}")
-        return agent_names, agent_companies  # Return whatever we found before the error
+
+def open_page(driver, url):
+    """Navigate a pooled driver politely and count the load towards its recycle limit."""
+    rate_limiter.wait(url)
+    driver.get(url)
+    driver_pool.count_page(driver)
 
 
-def extract_county_from_url(listing_url, address):
-    """Extract county name from the listing URL or address with improved accuracy."""
-    # Default value
-    county_name = "Unknown County"
+# Readiness predicates, each a single JS round trip per poll
+SEARCH_RESULTS_READY_JS = "return !!document.querySelector(\"a.card-link, a[href*='/listing/']\");"
+DETAIL_PAGE_READY_JS = """
+return !!document.querySelector('meta[name="description"]') &&
+       !!document.querySelector('div[data-tn="uc-listing-description"]');
+"""
+AGENT_SECTION_READY_JS = """
+return !!document.querySelector("a[data-tn='contactAgent-link-name'], li[data-tn='listing-page-listed-by-agents'], " +
+                                "div[class*='non-compass-contact-agent-slat']");
+"""
+
+
+def script_condition(script):
+    """Turns a boolean JS snippet into a WebDriverWait condition."""
+    return lambda d: d.execute_script(script)
+
+
+def wait_until(driver, condition, timeout=PAGE_READY_TIMEOUT, description="page"):
+    """
+    Wait for a readiness condition instead of sleeping a fixed time.
 
+    Returns:
+        The condition's truthy result, or None if it timed out
+    """
     try:
-        # Try multiple patterns to find county in the URL
-        county_patterns = [
-            r"homes-for-sale/([a-zA-Z-]+)-md",  # Standard pattern
-            r"/listing/\d+-[a-zA-Z-]+-([a-zA-Z-]+)-md",  # Extract from listing path
-        ]
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(condition)
+    except TimeoutException:
+        print(f"⚠️ Timed out waiting for {description} - continuing anyway")
+        return None
 
-        for pattern in county_patterns:
-            county_match = re.search(pattern, listing_url)
-            if county_match:
-                extracted_county = county_match.group(1).replace("-", " ").title()
-                if extracted_county and extracted_county != "Md":
-                    county_name = f"{extracted_county} County"
-                    break
 
-        # Check for specific cities in the URL that indicate Montgomery County
-        montgomery_locations = ["bethesda", "potomac", "chevy-chase", "rockville", "gaithersburg", "silver-spring"]
-        for location in montgomery_locations:
-            if location in listing_url.lower():
-                county_name = "Montgomery County"
-                break
+def find_listing_url(driver, address):
+    """
+    Search Compass for an address in a leased driver and return the first result's URL.
 
-        # If still unknown, check the address for city names
-        if county_name == "Unknown County" and address != "N/A":
-            cities_to_counties = {
-                "Bethesda": "Montgomery County",
-                "Potomac": "Montgomery County",
-                "Chevy Chase": "Montgomery County",
-                "Silver Spring": "Montgomery County",
-                "Rockville": "Montgomery County",
-                "Gaithersburg": "Montgomery County",
-                "Kensington": "Montgomery County"
-            }
-
-            for city, county in cities_to_counties.items():
-                if city in address:
-                    county_name = county
-                    break
+    Returns:
+        str: Listing URL, or None if the search had no results
+    """
+    # Convert address to a searchable format
+    search_address = address.replace(',', '').replace(' ', '+')
 
-        print(f"📍 Extracted county: {county_name} from {listing_url}")
-        return county_name
+    # Search for the listing
+    open_page(driver, f"https://www.compass.com/search/listings/?q={search_address}")
 
-    except Exception as e:
-        print(f"❌ Error extracting county: {e}")
-        return county_name
+    # Wait for search results to render
+    wait_until(driver, script_condition(SEARCH_RESULTS_READY_JS), description="search results")
+
+    # First try to find card link, then alternative selectors
+    listing_links = driver.find_elements(By.CSS_SELECTOR, "a.card-link")
+    if not listing_links:
+        listing_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/listing/']")
+
+    if not listing_links:
+        return None
+
+    return listing_links[0].get_attribute("href")
+
+
+def search_listing_url(address):
+    """
+    Search Compass for an address on a pooled driver and cache the listing URL it finds.
+
+    Returns:
+        str: Listing URL, or None if the search had no results
+    """
+    with driver_pool.lease() as driver:
+        listing_url = find_listing_url(driver, address)
+
+    if listing_url is None:
+        print(f"No listings found for address: {address}")
+        return None
+
+    print(f"Found listing URL: {listing_url}")
+    listing_store.remember_address(address, listing_url)
+    return listing_url
+
+
+def _fetch_listing_fields(listing_url):
+    fields = fetch_listing_fields_http(listing_url) if USE_HTTP_FAST_PATH else None
+    if fields is None:
+        with driver_pool.lease() as driver:
+            fields = fetch_listing_fields_browser(driver, listing_url)
+    return fields
+
+
+def listing_shows_address(fields, address):
+    """False for a dead listing page (no address or photos) or one for another house number."""
+    if fields["address"] == "N/A" or not fields["image_urls"]:
+        return False
+    return fields["address"].split()[0].lower() == address.split()[0].lower()
+
+
+def fetch_address_listing(address):
+    """
+    Resolve an address to its listing and fetch the listing fields.
+
+    A listing URL cached within ADDRESS_URL_TTL skips the Compass search. If its page no
+    longer shows the address (delisted, or relisted under a new ID), the cached URL is
+    dropped and the search runs once more.
+
+    Returns:
+        tuple: (listing_url, fields), or (None, None) if no listing was found
+    """
+    listing_url = listing_store.get_listing_url(address, max_age=ADDRESS_URL_TTL)
+    if listing_url:
+        print(f"💾 Known listing URL for {address}: {listing_url}")
+        fields = _fetch_listing_fields(listing_url)
+        if listing_shows_address(fields, address):
+            return listing_url, fields
+
+        print(f"♻️ Cached listing URL for {address} no longer shows it - searching again")
+        listing_store.forget_address(address)
+
+    listing_url = search_listing_url(address)
+    if listing_url is None:
+        return None, None
+    return listing_url, _fetch_listing_fields(listing_url)
 
 
 def scrape_specific_listing(address):
@@ -219,251 +595,1031 @@ def scrape_specific_listing(address):
     Scrape a specific listing by address.
     Returns a dictionary with the listing information, including image URLs.
 
+    Addresses resolved before skip the Compass search (see fetch_address_listing), and
+    the detail page is tried over the HTTP fast path before a browser is leased.
+
     Args:
         address (str): The property address to scrape
 
     Returns:
-        dict: Listing data including image_urls list
+        dict: Listing data including image_urls list, or None if it could not be scraped
     """
     print(f"Scraping specific listing: {address}")
 
-    # Convert address to a searchable format
-    search_address = address.replace(',', '').replace(' ', '+')
+    try:
+        listing_url, fields = fetch_address_listing(address)
+        if listing_url is None:
+            return None
 
-    # Create a search URL
-    search_url = f"https://www.compass.com/search/listings/?q={search_address}"
+        print(f"Found {len(fields['image_urls'])} images for {address}")
 
-    # Set up the driver
-    driver = start_driver()
+        # Return minimal information needed for image processing
+        return {
+            "address": address,
+            "listing_url": listing_url,
+            "image_urls": fields["image_urls"]
+        }
 
+    except Exception as e:
+        print(f"Error scraping listing for {address}: {e}")
+        return None
+
+
+def iter_specific_listings(addresses, workers=SPECIFIC_LISTING_WORKERS):
+    """
+    Scrape many addresses concurrently on pooled drivers (see scrape_specific_listing).
+
+    Addresses with a cached listing URL skip the search; the rest share the driver
+    pool and the per-host rate limiter. Duplicate addresses are scraped once.
+
+    Yields:
+        tuple: (address, listing dict or None) in completion order
+    """
+    addresses = list(dict.fromkeys(addresses))
+    if not addresses:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(addresses))))
     try:
-        # Search for the listing
-        driver.get(search_url)
-        time.sleep(random.uniform(3, 5))
+        futures = {executor.submit(scrape_specific_listing, address): address for address in addresses}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Consumer stopped early - don't start the searches that haven't begun
+        executor.shutdown(wait=True, cancel_futures=True)
 
-        # Wait for page to load
-        wait_for_page_load(driver)
 
-        # Look for the first search result
-        try:
-            # First try to find card link
-            listing_links = driver.find_elements(By.CSS_SELECTOR, "a.card-link")
+def fetch_page_http(url):
+    """
+    Fetch a page through the on-disk cache.
+
+    Fresh cache hits never touch the network; stale entries are revalidated with
+    If-None-Match / If-Modified-Since and reused on a 304.
+
+    Returns:
+        str: Page HTML, or None if it could not be fetched
+    """
+    cached = page_cache.get(url) if USE_PAGE_CACHE else None
+    if cached and cached["fresh"]:
+        print(f"💾 Page cache hit: {url}")
+        return cached["body"]
 
-            # If that doesn't work, try alternative selectors
-            if not listing_links:
-                listing_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/listing/']")
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
 
-            if not listing_links:
-                print(f"No listings found for address: {address}")
-                return None
+    rate_limiter.wait(url)
 
-            # Click on the first result
-            listing_url = listing_links[0].get_attribute("href")
-            print(f"Found listing URL: {listing_url}")
-            driver.get(listing_url)
-            time.sleep(random.uniform(3, 5))
+    try:
+        response = http_session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"⚠️ Fast path request failed for {url}: {e}")
+        return None
 
-            # Wait for page to load
-            wait_for_page_load(driver)
+    if response.status_code == 304 and cached:
+        print(f"💾 Page cache revalidated: {url}")
+        page_cache.refresh(url)
+        return cached["body"]
 
-            # Extract image URLs
-            image_urls = []
+    if response.status_code != 200:
+        print(f"⚠️ Fast path got status {response.status_code} for {url}")
+        return None
 
-            # Get hero image
-            try:
-                hero_image = driver.find_element(By.ID, "media-gallery-hero-image")
-                if hero_image:
-                    src = hero_image.get_attribute("src")
-                    if src:
-                        image_urls.append(src)
-            except NoSuchElementException:
-                print("Hero image not found")
-
-            # Get carousel images
-            try:
-                carousel_images = driver.find_elements(By.CSS_SELECTOR, "img[data-flickity-lazyload-src]")
-                for img in carousel_images:
-                    img_url = img.get_attribute("data-flickity-lazyload-src")
-                    if img_url and img_url not in image_urls:
-                        image_urls.append(img_url)
-            except NoSuchElementException:
-                print("Carousel images not found")
-
-            # As a backup, get any large images on the page
-            if not image_urls:
-                all_images = driver.find_elements(By.TAG_NAME, "img")
-                for img in all_images:
-                    width = img.get_attribute("width")
-                    height = img.get_attribute("height")
-                    src = img.get_attribute("src")
-                    # Only get reasonably sized images
-                    if src and (width and int(width) > 400) and (height and int(height) > 400):
-                        if src not in image_urls:
-                            image_urls.append(src)
-
-            print(f"Found {len(image_urls)} images for {address}")
-
-            # Return minimal information needed for image processing
-            return {
-                "address": address,
-                "image_urls": image_urls
-            }
+    # Decode once; response.text builds a new copy of the page on every access
+    html = response.text
+    if USE_PAGE_CACHE:
+        page_cache.put(url, html, etag=response.headers.get("ETag"),
+                       last_modified=response.headers.get("Last-Modified"))
+    if ARCHIVE_PAGES:
+        archive_page(url, html, source="http", status=response.status_code,
+                     headers={key: response.headers[key] for key in ("ETag", "Last-Modified", "Date")
+                              if key in response.headers})
+    response.close()
+
+    return html
+
+
+def check_fast_path_fields(listing_url, fields):
+    """Return parsed fast path fields, or None if any of FAST_PATH_REQUIRED_FIELDS is missing."""
+    missing = [field for field in FAST_PATH_REQUIRED_FIELDS if fields[field] in ("N/A", "", [])]
+    if missing:
+        print(f"⚠️ Fast path missing {', '.join(missing)} for {listing_url} - falling back to browser")
+        return None
 
-        except Exception as e:
-            print(f"Error finding or processing listing page: {e}")
-            return None
+    return fields
 
-    except Exception as e:
-        print(f"Error scraping listing for {address}: {e}")
+
+def fetch_listing_fields_http(listing_url):
+    """
+    HTTP-only fast path: fetch the server-rendered detail page and parse it without a browser.
+
+    Returns:
+        dict: Parsed listing fields, or None if the page could not be fetched or is
+            missing any of FAST_PATH_REQUIRED_FIELDS (the caller falls back to Selenium)
+    """
+    html = fetch_page_http(listing_url)
+    if html is None:
         return None
 
-    finally:
-        driver.quit()
+    return check_fast_path_fields(listing_url, parse_listing_html(html, listing_url))
+
 
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
 
-def scrape_listings():
-    """Scrapes the first page of real estate listings from Compass and uploads images if enabled."""
-    driver = start_driver()
-    driver.get(COMPASS_URL)
-    time.sleep(random.uniform(3, 6))
 
-    scraped_urls = set()
-    listings_data = []
+def submit_parse(html, listing_url=None):
+    """
+    Parse detail-page HTML in the shared process pool so the calling thread can go
+    fetch the next page. Falls back to parsing inline if the pool cannot start.
 
-    print("\nScraping Page 1...")
+    A pool broken by a dying child (e.g. killed for memory) is dropped and this page
+    parsed inline; the next call starts a fresh pool.
 
+    Returns:
+        Future: Resolves to the parse_listing_html fields dict
+    """
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            try:
+                _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                                  mp_context=multiprocessing.get_context(PARSE_START_METHOD))
+                atexit.register(_parse_pool.shutdown)
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Parse pool unavailable, parsing inline: {e}")
+                _parse_pool = False
+        pool = _parse_pool
+
+    if pool:
+        try:
+            return pool.submit(parse_listing_html, html, listing_url)
+        except BrokenProcessPool:
+            print("⚠️ Parse pool broke (a worker process died) - restarting it")
+            with _parse_pool_lock:
+                if _parse_pool is pool:
+                    _parse_pool = None
+            pool.shutdown(wait=False)
+
+    future = Future()
+    future.set_result(parse_listing_html(html, listing_url))
+    return future
+
+
+def cached_rendered_fields(listing_url):
+    """Return listing fields from a fresh cached browser snapshot, or None."""
+    cached = page_cache.get(listing_url, variant="snapshot") if USE_PAGE_CACHE else None
+    if cached and cached["fresh"]:
+        print(f"💾 Rendered page cache hit: {listing_url}")
+        return map_dom_snapshot(json.loads(cached["body"]))
+    return None
+
+
+def extract_rendered_listing(driver, listing_url):
+    """
+    Waits for the detail page in the driver's current tab and extracts it in-browser.
+
+    The compact in-page snapshot is what gets cached and archived for rendered pages.
+    """
+    # Wait for the listing content to render
+    wait_until(driver, script_condition(DETAIL_PAGE_READY_JS), description="listing page")
+
+    # Try to locate agent section and scroll to it to ensure it's loaded
     try:
-        listings_container = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".sc-mrags4.kgcPsu"))
-        )
+        agent_sections = driver.find_elements(By.CSS_SELECTOR,
+                                              "[data-tn*='agent'], .agent-card, div[class*='Agent'], div[class*='agent'], [data-tn='listing-page-listed-by-agents']")
+        if agent_sections:
+            driver.execute_script("arguments[0].scrollIntoView(true);", agent_sections[0])
+            wait_until(driver, script_condition(AGENT_SECTION_READY_JS), timeout=AGENT_READY_TIMEOUT,
+                       description="agent section")
+    except Exception as e:
+        print(f"⚠️ Could not scroll to agent section: {e}")
+
+    snapshot = driver.execute_script(LISTING_SNAPSHOT_JS)
+    if USE_PAGE_CACHE or ARCHIVE_PAGES:
+        snapshot_json = json.dumps(snapshot)
+        if USE_PAGE_CACHE:
+            page_cache.put(listing_url, snapshot_json, variant="snapshot")
+        if ARCHIVE_PAGES:
+            archive_page(listing_url, snapshot_json, kind="snapshot", source="browser")
+
+    return map_dom_snapshot(snapshot)
+
 
-        for _ in range(20):  # Scroll within the listings container
-            driver.execute_script("arguments[0].scrollTop += 500;", listings_container)
-            time.sleep(1.5)
+def fetch_listing_fields_browser(driver, listing_url):
+    """
+    Loads a detail page in a leased driver and extracts the rendered fields in-browser.
+
+    A fresh cached snapshot skips the navigation entirely.
+    """
+    fields = cached_rendered_fields(listing_url)
+    if fields is not None:
+        return fields
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        listings = soup.find_all("div", class_="uc-listingCard")
-        print(f"Total listings found: {len(listings)}")
+    open_page(driver, listing_url)
+    return extract_rendered_listing(driver, listing_url)
 
-        for listing in listings:
-            link_tag = listing.find("a", href=True)
-            listing_url = f"https://www.compass.com{link_tag['href']}" if link_tag else None
 
-            if not listing_url or "/private-exclusives/" in listing_url or listing_url in scraped_urls:
+class TabPrefetcher:
+    """
+    Keeps a small window of listing pages loading in background tabs of one driver.
+
+    While the oldest tab is being extracted, the next ones are already loading.
+    Every tab opened goes through the shared rate limiter, and at most `max_tabs`
+    are pending at once.
+    """
+
+    def __init__(self, driver, max_tabs=PREFETCH_TABS):
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.home_handle = driver.current_window_handle
+        self._tabs = collections.deque()  # (key, listing_url, window handle), oldest first
+
+    @property
+    def pending(self):
+        return len(self._tabs)
+
+    def has_room(self):
+        return len(self._tabs) < self.max_tabs
+
+    def open(self, key, listing_url):
+        """Start loading a listing in a new background tab, set up like the driver's first one."""
+        rate_limiter.wait(listing_url)
+
+        # Open the tab empty so blocking and stealth are in place before the page loads
+        self.driver.switch_to.new_window("tab")
+        handle = self.driver.current_window_handle
+        try:
+            configure_tab(self.driver)
+            # Assigning location returns at once, so the page loads while we move on
+            self.driver.execute_script("window.location.href = arguments[0];", listing_url)
+        except Exception:
+            self._close_tab(handle)
+            raise
+
+        self.driver.switch_to.window(self.home_handle)
+        driver_pool.count_page(self.driver)
+        self._tabs.append((key, listing_url, handle))
+
+    def peek(self):
+        """Return (key, listing_url, handle) of the oldest pending tab."""
+        return self._tabs[0]
+
+    def take(self):
+        """
+        Extract the oldest pending tab and close it.
+
+        Returns:
+            dict: The listing fields rendered in that tab
+        """
+        key, listing_url, handle = self._tabs.popleft()
+        try:
+            self.driver.switch_to.window(handle)
+            return extract_rendered_listing(self.driver, listing_url)
+        finally:
+            self._close_tab(handle)
+
+    def close(self):
+        """
+        Close every pending tab, leaving the driver on its original tab.
+
+        Returns:
+            list: (key, listing_url) of the tabs that were closed before being extracted
+        """
+        abandoned = []
+        while self._tabs:
+            key, listing_url, handle = self._tabs.popleft()
+            abandoned.append((key, listing_url))
+            self._close_tab(handle)
+        return abandoned
+
+    def _close_tab(self, handle):
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except WebDriverException:
+            pass
+        finally:
+            self.driver.switch_to.window(self.home_handle)
+
+
+def _county_fields(county_name):
+    return {
+        "instagram_account": f"Most Expensive Homes in {county_name}",
+        "county": county_name.replace(" County", ""),
+    }
+
+
+def scrape_listing_details(listing_url, fields=None, try_fast_path=USE_HTTP_FAST_PATH, county=None):
+    """
+    Scrapes a single listing detail page and returns its listing dict.
+
+    Tries the HTTP fast path first and only leases a browser when that fails.
+
+    Args:
+        listing_url (str): Listing detail page URL
+        fields (dict): Fast path fields already parsed by the caller, if any
+        try_fast_path (bool): Whether to attempt the HTTP fast path when `fields` is not given
+        county (str): County of the search the listing came from, e.g. "Montgomery County".
+            Inferred from the URL and address when not given.
+    """
+    print(f"Scraping: {listing_url}")
+
+    if fields is None and try_fast_path:
+        fields = fetch_listing_fields_http(listing_url)
+    if fields is None:
+        with driver_pool.lease() as driver:
+            fields = fetch_listing_fields_browser(driver, listing_url)
+
+    address = fields["address"]
+    image_urls = fields["image_urls"]
+
+    print(f"✅ Extracted Agents: {fields['listing_agents']}")
+    print(f"✅ Extracted Companies: {fields['agent_company']}")
+
+    # ✅ Use the county we searched in, falling back to inferring it from the listing
+    county_name = county or extract_county_from_url(listing_url, address)
+
+    listing = {
+        "listing_url": listing_url,
+        "price": fields["price"],
+        "address": address,
+        "beds": fields["beds"],
+        "baths": fields["baths"],
+        "sqft": fields["sqft"],
+        "description": fields["description"],
+        "instagram_caption": None,
+        "listing_agents": fields["listing_agents"],
+        "agent_company": fields["agent_company"],
+        "image_urls": image_urls  # Include the image URLs in the returned data
+    }
+    # ✅ Instagram account "Most Expensive Homes in {County Name}", county stored without the suffix
+    listing.update(_county_fields(county_name))
+
+    # ✅ Skip uploads and captioning for listings whose content hasn't changed
+    changed = listing_store.record_scrape(listing)
+    if not changed:
+        print(f"⏭️ Unchanged since last run: {listing_url}")
+
+    # ✅ Only create a folder & upload images **if SKIP_IMAGE_UPLOAD is False**
+    if not SKIP_IMAGE_UPLOAD and not listing_store.stage_done(listing_url, "uploaded"):
+        listing_folder_id = create_drive_folder(address)
+        uploaded_images = [
+            upload_image_to_drive(img_url, listing_folder_id, address, idx)
+            for idx, img_url in enumerate(image_urls, start=1)
+        ]
+        listing_store.mark_stage(listing_url, "uploaded", uploaded_images=uploaded_images)
+
+    # ✅ Caption with the agent attribution, reusing the stored caption while the content is unchanged
+    if listing_store.stage_done(listing_url, "captioned"):
+        listing["instagram_caption"] = listing_store.get_record(listing_url).get("instagram_caption")
+    else:
+        listing["instagram_caption"] = generate_instagram_post(fields["description"], fields["price"],
+                                                               fields["beds"], fields["baths"], fields["sqft"],
+                                                               address, fields["listing_agents"],
+                                                               fields["agent_company"])
+        listing_store.mark_stage(listing_url, "captioned", instagram_caption=listing["instagram_caption"])
+
+    return listing
+
+
+def _format_price_filter(price):
+    """Render a price the way Compass search URLs spell it: 2000000 -> "2M", 750000 -> "750K"."""
+    if price % 1_000_000 == 0:
+        return f"{price // 1_000_000}M"
+    if price % 1_000 == 0:
+        return f"{price // 1_000}K"
+    return str(price)
+
+
+def build_search_url(base_url=COMPASS_URL, start=0, price_min=None, price_max=None):
+    """
+    Build a Compass search URL for one slice of the search space.
+
+    Compass keeps its filters as path segments, e.g.
+    /homes-for-sale/montgomery-county-md/price.min=2M/price.max=5M/sort=desc-price/start=41/
+    Any price or offset segments already on `base_url` are replaced.
+
+    Args:
+        base_url (str): Search URL to start from (area and sort order)
+        start (int): Result offset; pages are SEARCH_PAGE_SIZE cards apart
+        price_min (int): Lowest list price, or None for no lower bound
+        price_max (int): Highest list price, or None for no upper bound
+
+    Returns:
+        str: The search URL
+    """
+    parsed = urlparse(base_url)
+    segments = [segment for segment in parsed.path.split("/") if segment
+                and not segment.startswith(("price.min=", "price.max=", "start="))]
+
+    filters = []
+    if price_min:
+        filters.append(f"price.min={_format_price_filter(price_min)}")
+    if price_max:
+        filters.append(f"price.max={_format_price_filter(price_max)}")
+
+    # Filters go ahead of the sort segment, the offset always last
+    sort_index = next((i for i, segment in enumerate(segments) if segment.startswith("sort=")), len(segments))
+    segments[sort_index:sort_index] = filters
+    if start:
+        segments.append(f"start={start}")
+
+    return urlunparse(parsed._replace(path="/" + "/".join(segments) + "/"))
+
+
+class SeenUrls:
+    """Thread-safe set of listing URLs already claimed by one of the concurrent partition crawls."""
+
+    def __init__(self):
+        self._urls = set()
+        self._lock = threading.Lock()
+
+    def claim(self, url):
+        """Return True the first time a URL is seen, False afterwards."""
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            return True
+
+
+class CardScan:
+    """
+    Applies the early stop rules to search cards as they load.
+
+    COMPASS_URL is sorted by descending price, so once a card falls below
+    `min_price`, or `stop_after_known` cards in a row are already known and
+    unchanged, nothing further down the results can qualify or be new.
+    """
+
+    def __init__(self, min_price=None, stop_after_known=None, seen_urls=None):
+        self.min_price = min_price
+        self.stop_after_known = stop_after_known
+        self.seen_urls = seen_urls or SeenUrls()
+        self.cards = []
+        self.scanned = 0  # Cards on the current page read so far
+        self.stop_reason = None
+        self._known_streak = 0
+
+    @property
+    def stopped(self):
+        return self.stop_reason is not None
+
+    def add(self, cards):
+        """
+        Take the next cards in page order until a stop rule fires.
+
+        Returns:
+            int: Number of cards that were new to the crawl
+        """
+        added = 0
+        for card in cards:
+            if self.stopped:
+                break
+            if not self.seen_urls.claim(card["listing_url"]):
                 continue
 
-            print(f"Scraping: {listing_url}")
-            scraped_urls.add(listing_url)
+            price = parse_price(card["price"])
+            if self.min_price and price is not None and price < self.min_price:
+                self.stop_reason = f"{card['price']} is below the ${self.min_price:,} floor"
+                break
 
-            driver.get(listing_url)
-            time.sleep(random.uniform(3, 6))
+            self.cards.append(card)
+            added += 1
+
+            if self.stop_after_known:
+                self._known_streak = self._known_streak + 1 if listing_store.card_unchanged(card) else 0
+                if self._known_streak >= self.stop_after_known:
+                    self.stop_reason = f"{self._known_streak} known listings in a row"
+
+        return added
+
+
+def scan_search_page(driver, search_url, scan):
+    """
+    Load one search results page and feed its cards to the scan as the page scrolls,
+    so scrolling stops as soon as a stop rule fires.
+
+    Returns:
+        tuple: (cards on the page, cards new to the crawl)
+    """
+    open_page(driver, search_url)
+
+    listings_container = WebDriverWait(driver, PAGE_READY_TIMEOUT).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, ".sc-mrags4.kgcPsu"))
+    )
+
+    scan.scanned = 0
+    added = 0
+
+    def read_new_cards(card_count):
+        nonlocal added
+        if card_count > scan.scanned and not scan.stopped:
+            added += scan.add(parse_search_cards(driver.execute_script(LISTING_CARDS_HTML_JS, scan.scanned)))
+            scan.scanned = card_count
+        return scan.stopped
+
+    card_count = scroll_listing_cards(driver, listings_container, stop_when=read_new_cards)
+    read_new_cards(card_count)
+    return card_count, added
+
+
+def crawl_search_partition(partition, scan, base_url=COMPASS_URL, max_pages=SEARCH_MAX_PAGES):
+    """
+    Page through one (price_min, price_max) search partition with `start=` offsets.
 
-            # Wait for page to load
-            wait_for_page_load(driver)
+    Stops at a short page, a page with nothing new, a stop rule or `max_pages`.
+
+    Returns:
+        list: The partition's cards in result order
+    """
+    with driver_pool.lease() as driver:
+        for page in range(max_pages):
+            page_url = build_search_url(base_url, page * SEARCH_PAGE_SIZE, *partition)
 
-            # Try to locate agent section and scroll to it to ensure it's loaded
             try:
-                agent_sections = driver.find_elements(By.CSS_SELECTOR,
-                                                      "[data-tn*='agent'], .agent-card, div[class*='Agent'], div[class*='agent'], [data-tn='listing-page-listed-by-agents']")
-                if agent_sections:
-                    driver.execute_script("arguments[0].scrollIntoView(true);", agent_sections[0])
-                    time.sleep(1)  # Give it a moment to load after scrolling
+                card_count, added = scan_search_page(driver, page_url, scan)
+            except TimeoutException:
+                # No results container - past the last page of this partition
+                break
+
+            print(f"📄 {page_url}: {card_count} cards, {added} new")
+            if scan.stopped or card_count < SEARCH_PAGE_SIZE or added == 0:
+                break
+
+    if scan.stopped:
+        print(f"🛑 Stopped {build_search_url(base_url, 0, *partition)} after {len(scan.cards)} listings: {scan.stop_reason}")
+
+    return scan.cards
+
+
+def search_partitions(min_price=None, price_bands=PRICE_BANDS):
+    """
+    Split the search into (price_min, price_max) partitions, most expensive first.
+
+    Bands ending at or below `min_price` are dropped and the floor is pushed into the
+    remaining ones, so Compass filters cheaper listings out server-side.
+    """
+    partitions = []
+    for band_min, band_max in price_bands or [(None, None)]:
+        if min_price and band_max and band_max <= min_price:
+            continue
+        if min_price:
+            band_min = max(band_min or 0, min_price)
+        partitions.append((band_min, band_max))
+    return partitions
+
+
+def collect_listing_cards(min_price=MIN_PRICE, stop_after_known=STOP_AFTER_KNOWN, price_bands=PRICE_BANDS,
+                          search_url=COMPASS_URL):
+    """
+    Crawls the Compass search and returns the parsed listing cards, most expensive partition first.
+
+    Each price band is paged through concurrently on its own pooled driver (all under
+    the shared per-host rate limiter), with one dedupe set across partitions so
+    overlapping bands or shifting pages never yield a listing twice.
+    """
+    partitions = search_partitions(min_price, price_bands)
+    seen_urls = SeenUrls()
+    scans = [CardScan(min_price, stop_after_known, seen_urls) for _ in partitions]
+
+    print(f"\nCrawling {len(partitions)} search partition(s) of {search_url}...")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(PARTITION_WORKERS, len(partitions)))) as executor:
+        futures = [executor.submit(crawl_search_partition, partition, scan, search_url)
+                   for partition, scan in zip(partitions, scans)]
+
+        cards = []
+        for partition, scan, future in zip(partitions, scans, futures):
+            try:
+                future.result()
             except Exception as e:
-                print(f"⚠️ Could not scroll to agent section: {e}")
-
-            listing_soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # ✅ Extract Basic Listing Details
-            price, beds, baths, sqft, address, description = "N/A", "N/A", "N/A", "N/A", "N/A", "N/A"
-
-            remarks_section = listing_soup.find("div", {"data-tn": "uc-listing-description"})
-            if remarks_section:
-                spans = remarks_section.find_all("span")
-                description = " ".join([span.text.strip() for span in spans if span.text.strip()])
-
-            meta_description = listing_soup.find("meta", {"name": "description"})
-            if meta_description:
-                content = meta_description["content"]
-                address_match = re.search(r"^(.*?)(?: is a single family home| is a townhome)", content)
-                if address_match:
-                    address = address_match.group(1)
-
-                price_match = re.search(r"listed for sale at (\$\d{1,3}(?:,\d{3})*)", content)
-                beds_match = re.search(r"(\d+)-bed", content)
-                baths_match = re.search(r"(\d+)-bath", content)
-                sqft_match = re.search(r"(\d{1,3}(?:,\d{3})*) sqft", content)
-
-                if price_match:
-                    price = price_match.group(1)
-                if beds_match:
-                    beds = beds_match.group(1)
-                if baths_match:
-                    baths = baths_match.group(1)
-                if sqft_match:
-                    sqft = sqft_match.group(1)
-
-            # ✅ Extract Listing Agents (Compass & Non-Compass) using the improved method
-            agent_names, agent_companies = extract_agents(driver, listing_soup)
-
-            # ✅ Store agent names and companies separately
-            listing_agents = "; ".join(agent_names)  # ✅ Separate multiple agents with ";"
-            agent_company = "; ".join(agent_companies)  # ✅ Separate multiple companies with ";"
-
-            print(f"✅ Extracted Agents: {listing_agents}")
-            print(f"✅ Extracted Companies: {agent_company}")
-
-            # ✅ Only create a folder & upload images **if SKIP_IMAGE_UPLOAD is False**
-            listing_folder_id = None
-            if not SKIP_IMAGE_UPLOAD:
-                listing_folder_id = create_drive_folder(address)
-
-            image_urls = []
-            hero_image = listing_soup.find("img", id="media-gallery-hero-image")
-            if hero_image and hero_image.get("src"):
-                image_urls.append(hero_image["src"])
-
-            carousel_images = listing_soup.select("img[data-flickity-lazyload-src]")
-            for img in carousel_images:
-                if img.get("data-flickity-lazyload-src"):
-                    image_urls.append(img["data-flickity-lazyload-src"])
-
-            drive_image_links = []
-            if not SKIP_IMAGE_UPLOAD:
-                drive_image_links = [
-                    upload_image_to_drive(img_url, listing_folder_id, address, idx)
-                    for idx, img_url in enumerate(image_urls, start=1)
-                ]
-
-            # ✅ Extract county name with the improved method
-            county_name = extract_county_from_url(listing_url, address)
-
-            # ✅ Set Instagram account name as "Most Expensive Homes in {County Name}"
-            instagram_account = f"Most Expensive Homes in {county_name}"
-
-            # Generate Instagram caption
-            instagram_caption = generate_instagram_post(description, price, beds, baths, sqft, address)
-
-            # ✅ Append Listing Data
-            listings_data.append({
-                "listing_url": listing_url,
-                "price": price,
-                "address": address,
-                "beds": beds,
-                "baths": baths,
-                "sqft": sqft,
-                "description": description,
-                "instagram_account": instagram_account,
-                "instagram_caption": instagram_caption,
-                "listing_agents": listing_agents,
-                "agent_company": agent_company,
-                "county": county_name.replace(" County", ""),  # Store county name without "County" suffix
-                "image_urls": image_urls  # Include the image URLs in the returned data
-            })
+                print(f"❌ Error crawling {build_search_url(search_url, 0, *partition)}: {e}")
+            # Keep whatever the partition collected before it stopped
+            cards.extend(scan.cards)
+
+    print(f"Total listings found: {len(cards)}")
+    return cards
+
+
+_WORKER_DONE = object()  # Sentinel a detail worker puts on the result queue when it exits
+
+
+def _tabbed_listing_detail_worker(url_queue, result_queue, stop_event, county=None):
+    """
+    Browser-only variant of the detail worker: a leased driver works through the
+    shared URL queue with a TabPrefetcher, so page loads overlap extraction.
+
+    Once the driver passes its page or memory limit (see DriverPool.should_recycle)
+    its pending tabs go back on the queue and the worker continues on a fresh driver.
+    """
+    try:
+        recycle = True
+        while recycle:
+            recycle = False
+
+            with driver_pool.lease() as driver:
+                tabs = TabPrefetcher(driver)
+
+                def finish(index, listing_url, fields):
+                    try:
+                        if fields is None:
+                            # Tab failed - load it in the driver's own tab instead
+                            fields = fetch_listing_fields_browser(driver, listing_url)
+                        listing = scrape_listing_details(listing_url, fields, try_fast_path=False, county=county)
+                        result_queue.put((index, listing))
+                    except Exception as e:
+                        print(f"❌ Error scraping {listing_url}: {e}")
+                    finally:
+                        url_queue.task_done()
+
+                try:
+                    while True:
+                        # Top up the window of loading tabs (none once the driver is due for recycling)
+                        while tabs.has_room() and not stop_event.is_set() and not driver_pool.should_recycle(driver):
+                            try:
+                                index, listing_url = url_queue.get_nowait()
+                            except queue.Empty:
+                                break
+
+                            fields = cached_rendered_fields(listing_url)
+                            if fields is not None:
+                                finish(index, listing_url, fields)
+                                continue
+
+                            try:
+                                tabs.open(index, listing_url)
+                            except Exception as e:
+                                print(f"⚠️ Could not open a tab for {listing_url}: {e}")
+                                finish(index, listing_url, None)
+
+                        if not tabs.pending:
+                            break
+
+                        index, listing_url, _ = tabs.peek()
+                        try:
+                            fields = tabs.take()
+                        except Exception as e:
+                            print(f"⚠️ Could not extract tab for {listing_url}: {e}")
+                            fields = None
+                        finish(index, listing_url, fields)
+
+                        if driver_pool.should_recycle(driver) and not stop_event.is_set() \
+                                and (tabs.pending or not url_queue.empty()):
+                            recycle = True
+                            break
+                finally:
+                    # Hand unextracted tabs back so this worker (or another) loads them again
+                    for index, listing_url in tabs.close():
+                        url_queue.put((index, listing_url))
+                        url_queue.task_done()
 
     except Exception as e:
-        print(f"❌ Error during scraping: {e}")
+        print(f"❌ Tabbed worker stopped: {e}")
 
     finally:
-        driver.quit()
+        result_queue.put(_WORKER_DONE)
+
+
+def _listing_detail_worker(url_queue, result_queue, stop_event, county=None):
+    """
+    Drains the shared URL queue, pushing (index, listing) pairs as each one is scraped.
+
+    Fast path pages are pipelined: the HTML is handed to the parse pool and the worker
+    goes straight on to fetch the next URL, finishing listings once their parse is done.
+    """
+    in_flight = collections.deque()
+
+    def finish(index, listing_url, parse_future):
+        try:
+            fields = None
+            if parse_future is not None:
+                try:
+                    fields = check_fast_path_fields(listing_url, parse_future.result())
+                except Exception as e:
+                    # e.g. BrokenProcessPool - the browser still gets this listing
+                    print(f"⚠️ Parse failed for {listing_url}, falling back to the browser: {e}")
+            result_queue.put((index, scrape_listing_details(listing_url, fields, try_fast_path=False, county=county)))
+        except Exception as e:
+            print(f"❌ Error scraping {listing_url}: {e}")
+        finally:
+            url_queue.task_done()
+
+    try:
+        while not stop_event.is_set():
+            try:
+                index, listing_url = url_queue.get_nowait()
+            except queue.Empty:
+                break
 
-    return listings_data
\ No newline at end of file
+            parse_future = None
+            if USE_HTTP_FAST_PATH:
+                try:
+                    html = fetch_page_http(listing_url)
+                    if html is not None:
+                        parse_future = submit_parse(html, listing_url)
+                    # The parse pool has its own copy; don't hold the page while the next one downloads
+                    html = None
+                    memory_monitor.sample()
+                except Exception as e:
+                    print(f"⚠️ Fast path failed for {listing_url}: {e}")
+
+            in_flight.append((index, listing_url, parse_future))
+
+            # Finish whatever has parsed, keeping at most PARSE_PIPELINE_DEPTH pages in flight
+            while in_flight and (len(in_flight) > PARSE_PIPELINE_DEPTH or in_flight[0][2] is None
+                                 or in_flight[0][2].done()):
+                finish(*in_flight.popleft())
+
+        while in_flight:
+            finish(*in_flight.popleft())
+
+    finally:
+        result_queue.put(_WORKER_DONE)
+
+
+def _below_price_floor(listing, min_price):
+    price = parse_price(listing.get("price"))
+    return bool(min_price and price is not None and price < min_price)
+
+
+def _open_checkpoint(resume):
+    """Load the last run's checkpoint when resuming; otherwise start a fresh one."""
+    checkpoint = ScrapeCheckpoint()
+    if not (resume and checkpoint.load()):
+        checkpoint.clear()
+    return checkpoint
+
+
+def _finish_checkpoint(checkpoint):
+    """Drop the checkpoint once every listing of the run is done; keep it so failures are retried on resume."""
+    if checkpoint.all_done():
+        checkpoint.clear()
+    else:
+        print(f"💾 Some listings failed - run again with resume to retry them ({checkpoint.path})")
+
+
+def _iter_indexed_listings(workers, min_price=MIN_PRICE, stop_after_known=STOP_AFTER_KNOWN,
+                           search_url=COMPASS_URL, county=None, checkpoint=None):
+    """Runs the detail workers in the background and yields (search position, listing) as they finish."""
+    saved = checkpoint.search_state(search_url) if checkpoint else None
+    completed = {}
+
+    if saved:
+        # ✅ Resuming: reuse the cards found last time and skip every listing already finished
+        cards = saved["cards"]
+        completed = {int(index): listing for index, listing in saved["completed"].items()}
+        print(f"♻️ {search_url}: {len(completed)} of {len(cards)} listings done in the last run")
+    else:
+        try:
+            cards = collect_listing_cards(min_price, stop_after_known, search_url=search_url)
+        except Exception as e:
+            print(f"❌ Error during scraping: {e}")
+            return
+        if checkpoint:
+            checkpoint.start_search(search_url, county, cards)
+
+    # ✅ Discovery mode: only open detail pages for new listings or ones whose card changed
+    known_listings = []
+    url_queue = queue.Queue()
+    card_hashes = {}
+
+    for index, card in enumerate(cards):
+        if index in completed:
+            known_listings.append((index, completed[index]))
+            continue
+
+        stored = listing_store.card_unchanged(card) if CARD_DISCOVERY else None
+        if stored:
+            if county:
+                stored.update(_county_fields(county))
+            # None marks a listing that is done but below the price floor
+            known_listings.append((index, None if _below_price_floor(stored, min_price) else stored))
+        else:
+            url_queue.put((index, card["listing_url"]))
+            card_hashes[card["listing_url"]] = card["card_hash"]
+
+    if CARD_DISCOVERY:
+        print(f"🔎 {len(known_listings)} listings unchanged or already done, "
+              f"{url_queue.qsize()} need detail pages")
+
+    if checkpoint:
+        checkpoint.complete_listings(search_url, [item for item in known_listings if item[0] not in completed])
+
+    yield from ((index, listing) for index, listing in known_listings if listing is not None)
+
+    if url_queue.empty():
+        return
+
+    result_queue = queue.Queue()
+    stop_event = threading.Event()
+    workers = max(1, min(workers, url_queue.qsize()))
+
+    if workers > 1:
+        print(f"🚀 Scraping {url_queue.qsize()} listings with {workers} workers")
+
+    # Browser-only runs keep several tabs loading per driver; otherwise use the HTTP pipeline
+    worker = _tabbed_listing_detail_worker if not USE_HTTP_FAST_PATH and PREFETCH_TABS > 1 else _listing_detail_worker
+
+    for _ in range(workers):
+        threading.Thread(target=worker, args=(url_queue, result_queue, stop_event, county), daemon=True).start()
+
+    try:
+        finished_workers = 0
+        while finished_workers < workers:
+            item = result_queue.get()
+            if item is _WORKER_DONE:
+                finished_workers += 1
+            else:
+                index, listing = item
+                listing_url = listing["listing_url"]
+                listing_store.record_card(listing_url, card_hashes[listing_url])
+
+                # The card may not have shown a price; the detail page always does
+                if _below_price_floor(listing, min_price):
+                    print(f"⏭️ Skipping {listing_url}: {listing['price']} is below the price floor")
+                    listing = None
+
+                # ✅ Checkpoint after every listing so a crashed run can resume from here
+                if checkpoint:
+                    checkpoint.complete_listings(search_url, [(index, listing)])
+                if listing is not None:
+                    yield item
+    finally:
+        # Consumer stopped early (or raised) - let the workers wind down after their current listing
+        stop_event.set()
+
+
+def iter_listings(workers=SCRAPE_WORKERS, min_price=MIN_PRICE, stop_after_known=STOP_AFTER_KNOWN, resume=False):
+    """
+    Streams listings from the Compass search (see collect_listing_cards) as each detail page is parsed.
+
+    Scraping runs in background worker threads, so the caller can upload images
+    and save one listing while the next ones are being scraped.
+    Listings arrive in completion order, which matches search order when workers=1.
+
+    Args:
+        workers (int): Number of workers visiting listing detail pages in parallel.
+            They share one work queue and the per-host rate limiter; workers beyond
+            DRIVER_POOL_SIZE simply wait for a free driver.
+        min_price (int): Only return listings at or above this price. The search page is
+            sorted by descending price, so the card scan stops at the first cheaper card.
+        stop_after_known (int): Stop the card scan after this many consecutive listings
+            that were already scraped and whose card has not changed.
+        resume (bool): Continue the run recorded in the checkpoint file (see checkpoint.py)
+            instead of starting over; listings it already finished are not visited again.
+
+    Yields:
+        dict: One listing dict per scraped detail page
+    """
+    checkpoint = _open_checkpoint(resume)
+    memory_monitor.reset()
+    try:
+        for _, listing in _iter_indexed_listings(workers, min_price, stop_after_known, checkpoint=checkpoint):
+            yield listing
+        _finish_checkpoint(checkpoint)
+    finally:
+        memory_monitor.report()
+
+
+def scrape_listings(workers=SCRAPE_WORKERS, min_price=MIN_PRICE, stop_after_known=STOP_AFTER_KNOWN, resume=False):
+    """
+    Scrapes the real estate listings from the Compass search and uploads images if enabled.
+
+    Thin wrapper around the streaming scrape that waits for every listing; see
+    iter_listings for the price floor, known-listing stop rules and resume.
+
+    Returns:
+        list: Listing dicts in search-results order
+    """
+    checkpoint = _open_checkpoint(resume)
+    memory_monitor.reset()
+    try:
+        results = dict(_iter_indexed_listings(workers, min_price, stop_after_known, checkpoint=checkpoint))
+        _finish_checkpoint(checkpoint)
+    finally:
+        memory_monitor.report()
+
+    # ✅ Merge back in search-results order
+    return [results[index] for index in sorted(results)]
+
+
+def county_from_search_url(search_url):
+    """
+    Name the county of a Compass county search: ".../montgomery-county-md/..." -> "Montgomery County".
+
+    Returns None for any other search (city, ZIP, free text), so its listings get their
+    county from their own address (see extract_county_from_url).
+    """
+    segments = [segment for segment in urlparse(search_url).path.split("/") if segment]
+    if len(segments) < 2 or segments[0] != "homes-for-sale":
+        return None
+
+    match = COUNTY_SEARCH_SLUG_PATTERN.match(segments[1])
+    if not match:
+        return None
+    return " ".join(word.capitalize() for word in match.group(1).split("-")) + " County"
+
+
+def county_searches(search_urls=COUNTY_SEARCH_URLS):
+    """Normalise a list of search URLs or a {county name: search URL} dict into (county, URL) pairs."""
+    if isinstance(search_urls, str):
+        search_urls = [search_urls]
+    if isinstance(search_urls, dict):
+        return list(search_urls.items())
+    return [(county_from_search_url(url), url) for url in search_urls]
+
+
+def _iter_county_listings(search_urls, workers, min_price, stop_after_known, resume):
+    """Crawls several county searches at once and yields (county position, search position, listing)."""
+    searches = county_searches(search_urls)
+    pending = queue.Queue()
+    for position, (county, search_url) in enumerate(searches):
+        pending.put((position, county, search_url))
+
+    result_queue = queue.Queue()
+    stop_event = threading.Event()
+    checkpoint = _open_checkpoint(resume)
+    memory_monitor.reset()
+
+    def run_counties():
+        try:
+            while not stop_event.is_set():
+                try:
+                    position, county, search_url = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                print(f"\n🗺️ Scraping {county or 'search'}: {search_url}")
+                listings = _iter_indexed_listings(workers, min_price, stop_after_known, search_url, county, checkpoint)
+                try:
+                    for index, listing in listings:
+                        result_queue.put((position, index, listing))
+                        if stop_event.is_set():
+                            break
+                except Exception as e:
+                    print(f"❌ Error scraping {county or search_url}: {e}")
+                finally:
+                    listings.close()
+        finally:
+            result_queue.put(_WORKER_DONE)
+
+    county_workers = max(1, min(COUNTY_WORKERS, len(searches)))
+    for _ in range(county_workers):
+        threading.Thread(target=run_counties, daemon=True).start()
+
+    try:
+        finished_workers = 0
+        while finished_workers < county_workers:
+            item = result_queue.get()
+            if item is _WORKER_DONE:
+                finished_workers += 1
+            else:
+                yield item
+        _finish_checkpoint(checkpoint)
+    finally:
+        stop_event.set()
+        memory_monitor.report()
+
+
+def iter_county_listings(search_urls=COUNTY_SEARCH_URLS, workers=SCRAPE_WORKERS, min_price=MIN_PRICE,
+                         stop_after_known=STOP_AFTER_KNOWN, resume=False):
+    """
+    Streams listings from several county searches crawled concurrently.
+
+    Up to COUNTY_WORKERS counties run at once, each with its own detail workers; all of
+    them share the driver pool and the per-host rate limiter, so adding counties does
+    not add load on Compass. Listings from a county search are tagged with that county;
+    other searches (a city, a ZIP) leave the county to be inferred from each address.
+
+    Args:
+        search_urls (list | dict): County search URLs, or {county name: search URL} to
+            name the counties explicitly (names are otherwise taken from the URL)
+        workers (int): Detail workers per county (see iter_listings)
+        min_price (int): Price floor applied to every county (see iter_listings)
+        stop_after_known (int): Known-listing stop rule applied per county (see iter_listings)
+        resume (bool): Continue the checkpointed run instead of starting over (see iter_listings)
+
+    Yields:
+        dict: One listing dict per scraped detail page, counties interleaved
+    """
+    for _, _, listing in _iter_county_listings(search_urls, workers, min_price, stop_after_known, resume):
+        yield listing
+
+
+def scrape_counties(search_urls=COUNTY_SEARCH_URLS, workers=SCRAPE_WORKERS, min_price=MIN_PRICE,
+                    stop_after_known=STOP_AFTER_KNOWN, resume=False):
+    """
+    Scrapes several county searches concurrently into one combined result set.
+
+    Returns:
+        list: Listing dicts grouped by county in `search_urls` order, each in search-results order
+    """
+    county_listings = _iter_county_listings(search_urls, workers, min_price, stop_after_known, resume)
+    results = {(position, index): listing for position, index, listing in county_listings}
+    return [results[key] for key in sorted(results)]
@@ -2,52 +2,16 @@ import time
 import random
 import re
 from bs4 import BeautifulSoup, Comment
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium_stealth import stealth
+from scraper import driver_pool, open_page
 from drive_uploader import create_drive_folder, upload_image_to_drive
 from instagram_captions import generate_instagram_post
 from google_sheets import save_to_google_sheets
 
 
-def start_driver():
-    """Starts a headless Selenium WebDriver."""
-    try:
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")  # Runs Chrome in headless mode
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--dns-prefetch-disable")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-
-        # Add additional options to make scraping more robust
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-
-        stealth(driver,
-                languages=["en-US", "en"],
-                vendor="Google Inc.",
-                platform="Win32",
-                webgl_vendor="Intel Inc.",
-                renderer="Intel Iris OpenGL Engine",
-                fix_hairline=True,
-                )
-
-        return driver
-    except WebDriverException as e:
-        print(f"❌ Error initializing WebDriver: {e}")
-        raise
-
-
 def wait_for_page_load(driver, timeout=10):
     """Wait for the page to fully load with a timeout."""
     try:
@@ -273,8 +237,8 @@ def scrape_listing(listing_url):
     driver = None
 
     try:
-        driver = start_driver()
-        driver.get(listing_url)
+        driver = driver_pool.acquire()
+        open_page(driver, listing_url)
 
         # Wait for page to load
         wait_for_page_load(driver)
@@ -312,7 +276,7 @@ def scrape_listing(listing_url):
         }
     finally:
         if driver:
-            driver.quit()
+            driver_pool.release(driver)
 
 
 def print_listing_data(listing_data):
@@ -0,0 +1,54 @@
+from scraper import build_search_url, search_partitions, county_from_search_url
+
+BASE_URL = "https://www.compass.com/homes-for-sale/montgomery-county-md/sort=desc-price/"
+EXAMPLE_BANDS = [(5_000_000, None), (3_000_000, 5_000_000), (None, 3_000_000)]
+
+
+def test_build_search_url():
+    """Price filters go ahead of the sort segment, the offset always last."""
+    assert build_search_url(BASE_URL) == BASE_URL
+    assert build_search_url(BASE_URL, start=41) == f"{BASE_URL}start=41/"
+    assert build_search_url(BASE_URL, start=82, price_min=2_000_000, price_max=750_000) == (
+        "https://www.compass.com/homes-for-sale/montgomery-county-md/"
+        "price.min=2M/price.max=750K/sort=desc-price/start=82/"
+    )
+
+    # Filters and offsets already on the base URL are replaced, not duplicated
+    paged = build_search_url(BASE_URL, start=41, price_min=5_000_000)
+    assert build_search_url(paged, price_max=3_000_000) == (
+        "https://www.compass.com/homes-for-sale/montgomery-county-md/price.max=3M/sort=desc-price/"
+    )
+
+
+def test_search_partitions():
+    """Bands at or below the floor are dropped and the floor is pushed into the rest."""
+    assert search_partitions() == [(None, None)]
+    assert search_partitions(price_bands=EXAMPLE_BANDS) == EXAMPLE_BANDS
+    assert search_partitions(min_price=2_000_000) == [(2_000_000, None)]
+
+    assert search_partitions(min_price=2_000_000, price_bands=EXAMPLE_BANDS) == [
+        (5_000_000, None), (3_000_000, 5_000_000), (2_000_000, 3_000_000)
+    ]
+    # A band ending exactly at the floor would be an empty (3M, 3M) crawl
+    assert search_partitions(min_price=3_000_000, price_bands=EXAMPLE_BANDS) == [
+        (5_000_000, None), (3_000_000, 5_000_000)
+    ]
+    assert search_partitions(min_price=6_000_000, price_bands=EXAMPLE_BANDS) == [(6_000_000, None)]
+
+
+def test_county_from_search_url():
+    """Only county searches name a county; anything else leaves it to the listing's address."""
+    assert county_from_search_url(BASE_URL) == "Montgomery County"
+    assert county_from_search_url("https://www.compass.com/homes-for-sale/prince-georges-county-md/") == \
+        "Prince Georges County"
+    assert county_from_search_url("https://www.compass.com/homes-for-sale/bethesda-md/") is None
+    assert county_from_search_url("https://www.compass.com/homes-for-sale/20816/") is None
+    assert county_from_search_url("https://www.compass.com/search/sales/?q=x") is None
+
+
+# When run directly, execute the test functions
+if __name__ == "__main__":
+    test_build_search_url()
+    test_search_partitions()
+    test_county_from_search_url()
+    print("✅ Search URL, partition and county tests passed")